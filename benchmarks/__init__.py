@@ -0,0 +1 @@
+"""Benchmarks for the Dell printer component."""
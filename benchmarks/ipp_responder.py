@@ -0,0 +1,61 @@
+"""IPP responder for the stand-in printers, answering Get-Printer-Attributes.
+
+The values follow the web interface pages of the same printer, so both backends
+see the same printer. Only the requested attributes are returned, like a printer
+does, and other operations are answered with operation-not-supported.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import struct
+
+from pyipp.enums import IppOperation, IppStatus, IppTag
+from pyipp.parser import parse
+from pyipp.serializer import construct_attribute
+
+if TYPE_CHECKING:
+    from .stand_in import StandInPrinter
+
+
+def printer_attributes(printer: StandInPrinter) -> dict[str, tuple[IppTag, object]]:
+    """Return the printer attributes of a printer with their value tags."""
+
+    black = max(0, 200 - printer.polls % 200)
+    widths = [180, 120, 64, black]
+    return {
+        "marker-names": (IppTag.NAME, ["Cyan Toner", "Magenta Toner", "Yellow Toner", "Black Toner"]),
+        "marker-levels": (IppTag.INTEGER, [width // 2 for width in widths]),
+        "marker-high-levels": (IppTag.INTEGER, [100] * len(widths)),
+        "printer-state-message": (IppTag.TEXT, "Ready to Print"),
+        # the events page lists paper jams after its first entry
+        "printer-state-reasons": (IppTag.KEYWORD, "media-jam-error" if printer.config.events > 1 else "none"),
+        "printer-input-tray": (IppTag.STRING, "type=sheetFeedManual;maxcapacity=150;level=-3;status=0;name=MPF;"),
+        "printer-output-tray": (IppTag.STRING, "type=unRemovableBin;maxcapacity=100;remaining=-3;status=0;name=Output;"),
+        "media-ready": (IppTag.KEYWORD, "iso_a4_210x297mm"),
+        "pages-per-minute": (IppTag.INTEGER, 18),
+        "pages-per-minute-color": (IppTag.INTEGER, 15),
+        "printer-impressions-completed": (IppTag.INTEGER, 10000 + printer.polls),
+    }
+
+
+def ipp_response(printer: StandInPrinter, body: bytes) -> bytes:
+    """Return the response to an IPP request of a printer."""
+
+    request = parse(body)
+    version = request["version"]
+    operation = struct.unpack_from(">h", body, 2)[0]
+    status = IppStatus.OK if operation == IppOperation.GET_PRINTER_ATTRIBUTES else IppStatus.ERROR_OPERATION_NOT_SUPPORTED
+
+    response = struct.pack(">bbhi", *version, status, request["request-id"])
+    response += struct.pack(">b", IppTag.OPERATION)
+    response += construct_attribute("attributes-charset", "utf-8")
+    response += construct_attribute("attributes-natural-language", "en")
+    if status == IppStatus.OK:
+        requested = request["operation-attributes"].get("requested-attributes", "all")
+        requested = requested if isinstance(requested, list) else [requested]
+        response += struct.pack(">b", IppTag.PRINTER)
+        for name, (tag, value) in printer_attributes(printer).items():
+            if name in requested or "all" in requested:
+                response += construct_attribute(name, value, tag)
+    response += struct.pack(">b", IppTag.END)
+    return response
@@ -0,0 +1,110 @@
+"""Dell C1765nfw web interface pages for the stand-in printer.
+
+The pages follow the table layout the dell-printer-parser selectors expect.
+Toner levels and counters move with every poll when asked to, so the page
+cache of the integration can be defeated.
+"""
+from __future__ import annotations
+
+
+def _page(title: str, tables: list[str], padding: int) -> str:
+    """Nest the tables like the printer does: body > table > tr > td > table > tr > td > table."""
+    inner = "\n".join(
+        f"<table width=\"100%\"><tr><td>\n<table border=\"0\">\n{table}</table>\n</td></tr></table>"
+        for table in tables
+    )
+    filler = f"<!-- {'x' * padding} -->" if padding else ""
+    return (
+        f"<html>\n<head>\n<title>{title}</title>\n"
+        "<meta http-equiv=\"Content-Type\" content=\"text/html; charset=UTF-8\">\n</head>\n"
+        f"<body>\n<table><tr><td>\n{inner}\n</td></tr></table>\n{filler}\n</body>\n</html>\n"
+    )
+
+
+def _rows(pairs: list[tuple[str, object]]) -> str:
+    return "".join(
+        f"<tr><td><font size=\"2\">{label}</font></td><td><font size=\"2\">{value}</font></td></tr>\n"
+        for label, value in pairs
+    )
+
+
+def _level(width: int) -> str:
+    return (
+        "<tr><td><table cellspacing=\"0\"><tr>"
+        f"<td width=\"{width}\" height=\"12\" bgcolor=\"#000000\"></td><td></td>"
+        "</tr></table></td></tr>\n"
+    )
+
+
+def _header(text: str) -> str:
+    return f"<tr><td><b>{text}</b></td></tr>\n"
+
+
+def information(serial: str, padding: int = 0) -> str:
+    """Return the printer information page."""
+    return _page("Dell C1765nfw Color MFP", [
+        _header("Printer Information"),
+        _header("General"),
+        _header("Printer"),
+        _rows([
+            ("Dell Service Tag Number", "1ABCD23"),
+            ("Asset Tag Number", "-"),
+            ("Printer Serial Number", serial),
+            ("Memory Capacity", "128 MB"),
+            ("Processor Speed", "533 MHz"),
+        ]),
+        _rows([
+            ("Printer Type", "Color Laser"),
+            ("Printing Speed", "15 ppm"),
+            ("Firmware Version", "<b>01.10.01</b> (1765nfw)"),
+            ("Network Firmware Version", "V1.30 10-12-2016"),
+        ]),
+    ], padding)
+
+
+def print_volume(poll: int, padding: int = 0) -> str:
+    """Return the print volume page, the counters grow with the poll number."""
+    return _page("Print Volume", [
+        _header("Print Volume"),
+        _rows([("Printer Page Count", 10000 + poll)]),
+        _rows([
+            (paper, used + (poll if paper == "A4" else 0))
+            for paper, used in [
+                ("Letter", 12), ("B5", 0), ("A5", 3), ("A4", 9800), ("Executive", 0), ("Folio", 0),
+                ("Legal", 1), ("Envelope", 4), ("Monarch", 0), ("DL", 2), ("C5", 0), ("Others", 178),
+            ]
+        ]),
+    ], padding)
+
+
+def status(poll: int, padding: int = 0) -> str:
+    """Return the status page, the black toner drains with the poll number."""
+    toner = _header("Toner Level") + _header("Cyan Cartridge") + _level(180)
+    toner += _header("Magenta Cartridge") + _level(120)
+    toner += _header("Yellow Cartridge") + _level(64)
+    toner += _header("Black Cartridge") + _level(max(0, 200 - poll % 200))
+    return _page("Printer Status", [
+        _header("Printer Status"),
+        _header("Ready to Print"),
+        _header("Consumables"),
+        toner,
+        _header("Paper Tray") + "<tr><td>MPF</td><td><b>Ready</b></td><td>150 Sheets</td><td>A4</td></tr>\n",
+        _header("Output Tray") + "<tr><td>Output Tray</td><td><b>OK</b></td><td>100 Sheets</td></tr>\n",
+        _header("Cover") + "<tr><td>Rear Cover</td><td><b>Closed</b></td></tr>\n"
+        + "<tr><td>ADF Cover</td><td><b>Closed</b></td></tr>\n",
+        "<tr><td>Printer Type</td><td>Color Laser</td></tr>\n"
+        + "<tr><td>Printing Speed</td><td>Color 15 ppm<br>Mono 18 ppm</td></tr>\n",
+    ], padding)
+
+
+def events(entries: int = 1, padding: int = 0) -> str:
+    """Return the events page with a number of log entries."""
+    rows = "".join(
+        f"<tr><td><font><b>{location}</b></font></td><td><font><b>{details}</b></font></td></tr>\n"
+        for location, details in [("Printer", "Ready to Print")] + [("Tray 1", "Paper Jam")] * (entries - 1)
+    )
+    return (
+        "<html>\n<head><title>Events</title></head>\n<body>\n<table>\n"
+        f"<tr><td><font><b>Current Events</b></font></td></tr>\n{rows}</table>\n"
+        f"{'<!-- ' + 'x' * padding + ' -->' if padding else ''}\n</body>\n</html>\n"
+    )
@@ -0,0 +1,207 @@
+"""Measure what a poll costs, using the stand-in printers.
+
+Drives the real DellDataUpdateCoordinator and config flow of the integration
+against 1, 10, 100 and 500 simulated printers and reports per-poll wall time,
+parse time, requests, retained allocations and peak memory. The first poll of
+every printer loads all page groups, the following polls show the steady state.
+
+    python -m benchmarks.run --printers 1 10 100 500 --polls 5 --vary
+
+Run it from the repository root with Home Assistant installed.
+"""
+from __future__ import annotations
+from datetime import timedelta
+
+import argparse
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import (
+    CONF_HOST, CONF_NAME, CONF_SCAN_INTERVAL, EVENT_HOMEASSISTANT_CLOSE, EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.dell_printer import DellDataUpdateCoordinator
+from custom_components.dell_printer.client import DellPrinterClient
+from custom_components.dell_printer.config_flow import DellPrinterConfigFlow
+from custom_components.dell_printer.const import (
+    BACKEND_HTML, BACKEND_IPP, BACKEND_SNMP, BACKENDS, DEFAULT_SNMP_COMMUNITY, DOMAIN, FLEET_MAX_CONCURRENT_POLLS,
+    GROUP_KEYS, PARSE_WORKERS,
+)
+from custom_components.dell_printer.fleet import DellPrinterFleet
+from custom_components.dell_printer.instrumentation import create_trace_config
+from custom_components.dell_printer.ipp import DellPrinterIppClient
+from custom_components.dell_printer.snmp import DellPrinterSnmpClient, create_snmp_engine
+
+from .stand_in import StandInFleet, add_config_arguments, config_from_arguments
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+async def _timed(coroutine) -> float:
+    started = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - started
+
+
+async def _config_flow(hass: HomeAssistant, host: str) -> float:
+    """Run the user step of the config flow against a printer."""
+
+    flow = DellPrinterConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+    flow.flow_id = "benchmark"
+    flow.context = {"source": "user"}
+    return await _timed(flow.async_step_user({CONF_NAME: "Benchmark", CONF_HOST: host, CONF_SCAN_INTERVAL: 30}))
+
+
+async def _benchmark(count: int, arguments: argparse.Namespace) -> list[dict]:
+    """Poll a fleet of stand-in printers and return one row per poll round."""
+
+    snmp_port = None
+    if arguments.backend == BACKEND_SNMP:
+        snmp_port = 161 if arguments.spread_addresses else 16100
+    stand_in = StandInFleet(count, config_from_arguments(arguments), spread_addresses=arguments.spread_addresses,
+                            port=80 if arguments.spread_addresses else 18080, snmp_port=snmp_port)
+    await stand_in.start()
+
+    config_dir = tempfile.TemporaryDirectory()
+    hass = HomeAssistant(config_dir.name)
+    hass.config_entries = ConfigEntries(hass, {})
+
+    rows = []
+    connector = aiohttp.TCPConnector(limit=arguments.pool)
+    async with aiohttp.ClientSession(connector=connector, trace_configs=[create_trace_config()]) as session:
+        flow_time = None
+        if arguments.spread_addresses:
+            flow_time = await _config_flow(hass, stand_in.hosts[0])
+
+        fleet = DellPrinterFleet(hass, arguments.concurrency, arguments.parse_workers)
+        if arguments.backend == BACKEND_SNMP:
+            engine = create_snmp_engine()
+            clients = [
+                DellPrinterSnmpClient(session, host, engine, DEFAULT_SNMP_COMMUNITY, arguments.fast_extractor, port)
+                for host, port in zip(stand_in.hosts, stand_in.snmp_ports)
+            ]
+        elif arguments.backend == BACKEND_IPP:
+            clients = [
+                DellPrinterIppClient(session, host, arguments.fast_extractor, port)
+                for host, port in zip(stand_in.hosts, stand_in.ports)
+            ]
+        else:
+            clients = [DellPrinterClient(session, host, arguments.fast_extractor) for host in stand_in.hosts]
+        coordinators = [
+            DellDataUpdateCoordinator(
+                hass, _LOGGER, client, timedelta(seconds=30), Store(hass, 1, f"benchmark.{index}"), fleet
+            )
+            for index, client in enumerate(clients)
+        ]
+        for client in clients:
+            client.parse_pool = fleet.parse_pool
+            client.streaming = arguments.streaming
+        # stand in for the entities, which listen with their data keys, so that steady polls load the pages they read
+        for coordinator in coordinators:
+            for keys in GROUP_KEYS.values():
+                coordinator.async_add_listener(lambda: None, frozenset(keys))
+
+        tracemalloc.start()
+        for poll in range(arguments.polls):
+            parse_before = sum(coordinator.client.parse_seconds for coordinator in coordinators)
+            skipped_before = sum(coordinator.client.skipped_bytes for coordinator in coordinators)
+            requests_before = stand_in.requests
+            snapshot_before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            fleet.parse_pool.peak_depth = 0
+
+            started = time.perf_counter()
+            durations = await asyncio.gather(*(_timed(coordinator.async_refresh()) for coordinator in coordinators))
+            wall = time.perf_counter() - started
+
+            _, peak = tracemalloc.get_traced_memory()
+            retained = sum(
+                stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot_before, "filename")
+            )
+            parse = sum(coordinator.client.parse_seconds for coordinator in coordinators) - parse_before
+            skipped = sum(coordinator.client.skipped_bytes for coordinator in coordinators) - skipped_before
+            rows.append({
+                "printers": count,
+                "poll": "cold" if poll == 0 else f"steady {poll}",
+                "round_s": wall,
+                "poll_ms_p50": _percentile(durations, 50) * 1000,
+                "poll_ms_p95": _percentile(durations, 95) * 1000,
+                "parse_ms": parse / count * 1000,
+                "requests": (stand_in.requests - requests_before) / count,
+                "skipped_kib": skipped / count / 1024,
+                "failed": sum(not coordinator.last_update_success for coordinator in coordinators),
+                "queue_ms_max": max(coordinator.queue_delay for coordinator in coordinators) * 1000,
+                "parse_queue": fleet.parse_pool.peak_depth,
+                "retained_kib": retained / 1024,
+                "peak_mib": peak / 2**20,
+                "config_flow_ms": flow_time * 1000 if flow_time is not None and poll == 0 else None,
+            })
+        tracemalloc.stop()
+        # shut down like Home Assistant, which stops the parse pool and closes the client session of the fleet
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+        await hass.async_block_till_done()
+
+    await stand_in.stop()
+    config_dir.cleanup()
+    return rows
+
+
+def _print(rows: list[dict]) -> None:
+    columns = list(rows[0])
+    print(" ".join(f"{column:>14}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            if value is None:
+                value = "-"
+            elif isinstance(value, float):
+                value = f"{value:.2f}"
+            cells.append(f"{value:>14}")
+        print(" ".join(cells))
+
+
+def _arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--printers", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--polls", type=int, default=5, help="poll rounds per fleet size, the first one is cold")
+    parser.add_argument("--concurrency", type=int, default=FLEET_MAX_CONCURRENT_POLLS, help="printers polled at once")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS, help="threads that parse the pages")
+    parser.add_argument("--pool", type=int, default=100, help="connection pool size of the client session")
+    parser.add_argument("--fast-extractor", action="store_true", help="parse with the in-tree extractor")
+    parser.add_argument("--streaming", action="store_true", help="stop reading pages once all values were found")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_HTML, help="read the printers with")
+    parser.add_argument("--spread-addresses", action="store_true",
+                        help="serve every printer on its own loopback address and port 80, also runs the config flow")
+    add_config_arguments(parser)
+    return parser.parse_args()
+
+
+async def _main(arguments: argparse.Namespace) -> None:
+    rows = []
+    for count in arguments.printers:
+        rows.extend(await _benchmark(count, arguments))
+    _print(rows)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(_arguments()))
@@ -0,0 +1,117 @@
+"""SNMP agent for the stand-in printers, answering the Printer-MIB objects the integration reads.
+
+The values follow the web interface pages of the same printer, so both backends
+see the same printer. GET, GETNEXT and GETBULK requests of SNMP v1 and v2c are
+answered, other requests are ignored.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import asyncio
+import bisect
+import random
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api
+
+if TYPE_CHECKING:
+    from .stand_in import StandInPrinter
+
+PRINTER_MIB = (1, 3, 6, 1, 2, 1, 43)
+
+# hrDeviceDescr of the printer, the first device of the Host Resources MIB
+DEVICE_DESCRIPTION = (1, 3, 6, 1, 2, 1, 25, 3, 2, 1, 3, 1)
+
+
+def _oid(*parts: int) -> tuple:
+    return PRINTER_MIB + parts
+
+
+def printer_mib(printer: StandInPrinter, module) -> list[tuple[tuple, object]]:
+    """Return the objects of a printer, sorted by OID."""
+
+    black = max(0, 200 - printer.polls % 200)
+    objects = {
+        DEVICE_DESCRIPTION: module.OctetString("Dell C1765nfw Color MFP"),
+        _oid(5, 1, 1, 17, 1): module.OctetString(printer.serial),
+        _oid(10, 2, 1, 4, 1, 1): module.Counter32(10000 + printer.polls),
+        _oid(16, 5, 1, 2, 1, 1): module.OctetString("Ready to Print"),
+        _oid(6, 1, 1, 2, 1, 1): module.OctetString("Rear Cover"),
+        _oid(6, 1, 1, 2, 1, 2): module.OctetString("ADF Cover"),
+        _oid(6, 1, 1, 3, 1, 1): module.Integer(4),
+        _oid(6, 1, 1, 3, 1, 2): module.Integer(4),
+        _oid(8, 2, 1, 9, 1, 1): module.Integer(150),
+        _oid(8, 2, 1, 10, 1, 1): module.Integer(-3),
+        _oid(8, 2, 1, 11, 1, 1): module.Integer(0),
+        _oid(8, 2, 1, 12, 1, 1): module.OctetString("A4"),
+        _oid(8, 2, 1, 13, 1, 1): module.OctetString("MPF"),
+        _oid(9, 2, 1, 4, 1, 1): module.Integer(100),
+        _oid(9, 2, 1, 6, 1, 1): module.Integer(0),
+    }
+    for index, (color, width) in enumerate([("Cyan", 180), ("Magenta", 120), ("Yellow", 64), ("Black", black)], 1):
+        objects[_oid(11, 1, 1, 6, 1, index)] = module.OctetString(f"{color} Toner Cartridge")
+        objects[_oid(11, 1, 1, 8, 1, index)] = module.Integer(100)
+        objects[_oid(11, 1, 1, 9, 1, index)] = module.Integer(width // 2)
+
+    # the events page lists a paper jam for every entry after the first
+    for index in range(1, printer.config.events):
+        objects[_oid(18, 1, 1, 4, 1, index)] = module.Integer(8)
+        objects[_oid(18, 1, 1, 8, 1, index)] = module.OctetString("Paper Jam")
+    return sorted(objects.items())
+
+
+class SnmpAgent(asyncio.DatagramProtocol):
+    """Answer the SNMP requests of one stand-in printer."""
+
+    def __init__(self, printer: StandInPrinter) -> None:
+        self.printer = printer
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, address) -> None:
+        self.printer.requests += 1
+        # status is read with every SNMP request, like the status page counts the polls
+        if self.printer.config.vary:
+            self.printer.polls += 1
+        if random.random() < self.printer.config.error_rate:
+            # a lost datagram, the client times out
+            return
+
+        module = api.PROTOCOL_MODULES[int(api.decodeMessageVersion(data))]
+        request, _ = decoder.decode(data, asn1Spec=module.Message())
+        response = module.apiMessage.get_response(request)
+        request_pdu = module.apiMessage.get_pdu(request)
+        objects = printer_mib(self.printer, module)
+        oids = [tuple(oid) for oid, _ in module.apiPDU.get_varbinds(request_pdu)]
+
+        if request_pdu.isSameTypeWith(module.GetRequestPDU()):
+            found = dict(objects)
+            var_binds = [(oid, found.get(oid, module.Null(""))) for oid in oids]
+        elif request_pdu.isSameTypeWith(module.GetNextRequestPDU()):
+            var_binds = [self._next(objects, oid, module) for oid in oids]
+        elif module is not api.PROTOCOL_MODULES[api.SNMP_VERSION_1] and request_pdu.isSameTypeWith(module.GetBulkRequestPDU()):
+            non_repeaters = int(module.apiBulkPDU.get_non_repeaters(request_pdu))
+            repetitions = int(module.apiBulkPDU.get_max_repetitions(request_pdu))
+            var_binds = [self._next(objects, oid, module) for oid in oids[:non_repeaters]]
+            repeaters = oids[non_repeaters:]
+            for _ in range(repetitions):
+                row = [self._next(objects, oid, module) for oid in repeaters]
+                var_binds.extend(row)
+                repeaters = [oid for oid, _ in row]
+        else:
+            return
+
+        module.apiPDU.set_varbinds(module.apiMessage.get_pdu(response), var_binds)
+        payload = encoder.encode(response)
+        delay = self.printer.config.latency + random.uniform(0, self.printer.config.jitter)
+        asyncio.get_running_loop().call_later(delay, self.transport.sendto, payload, address)
+
+    @staticmethod
+    def _next(objects: list[tuple[tuple, object]], oid: tuple, module) -> tuple:
+        """Return the object following an OID, end of MIB view after the last one."""
+        position = bisect.bisect_right(objects, oid, key=lambda item: item[0])
+        if position == len(objects):
+            return oid, module.EndOfMibView() if hasattr(module, "EndOfMibView") else module.Null("")
+        return objects[position]
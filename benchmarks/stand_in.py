@@ -0,0 +1,198 @@
+"""Stand-in for the web interface of many Dell printers.
+
+Every simulated printer listens on its own port and has its own serial number.
+Latency, jitter, error rate and page size can be configured.
+
+    python -m benchmarks.stand_in --printers 10 --latency 0.05
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+from . import pages
+from .ipp_responder import ipp_response
+from .snmp_agent import SnmpAgent
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the simulated printers."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    padding: int = 0
+    events: int = 1
+    vary: bool = False
+
+
+class StandInPrinter:
+    """A single simulated printer."""
+
+    def __init__(self, serial: str, config: StandInConfig) -> None:
+        self.serial = serial
+        self.config = config
+        self.polls = 0
+        self.requests = 0
+
+    async def _respond(self, render, content_type: str = "text/html") -> web.Response:
+        self.requests += 1
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < self.config.error_rate:
+            raise web.HTTPInternalServerError()
+        body = render()
+        if isinstance(body, bytes):
+            return web.Response(body=body, content_type=content_type)
+        return web.Response(text=body, content_type=content_type)
+
+    async def language(self, request: web.Request) -> web.Response:
+        return await self._respond(lambda: "<html><body>OK</body></html>")
+
+    async def information(self, request: web.Request) -> web.Response:
+        return await self._respond(lambda: pages.information(self.serial, self.config.padding))
+
+    async def print_volume(self, request: web.Request) -> web.Response:
+        return await self._respond(lambda: pages.print_volume(self.polls, self.config.padding))
+
+    async def status(self, request: web.Request) -> web.Response:
+        # the status page is loaded on every poll, so it counts the polls
+        if self.config.vary:
+            self.polls += 1
+        return await self._respond(lambda: pages.status(self.polls, self.config.padding))
+
+    async def events(self, request: web.Request) -> web.Response:
+        return await self._respond(lambda: pages.events(self.config.events, self.config.padding))
+
+    async def ipp(self, request: web.Request) -> web.Response:
+        # status is read with every IPP request, like the status page counts the polls
+        if self.config.vary:
+            self.polls += 1
+        body = await request.read()
+        return await self._respond(lambda: ipp_response(self, body), "application/ipp")
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/default.asp", self.language)
+        app.router.add_get("/infomation.asp", self.information)
+        app.router.add_get("/prtmaint/prtvolume.asp", self.print_volume)
+        app.router.add_get("/status.asp", self.status)
+        app.router.add_get("/events.asp", self.events)
+        app.router.add_post("/ipp/print", self.ipp)
+        return app
+
+
+class StandInFleet:
+    """Run a number of simulated printers.
+
+    By default the printers listen on consecutive ports of one address. With
+    spread_addresses every printer gets its own loopback address on the same
+    port instead, which is needed for port 80 hosts that the config flow accepts.
+    With an snmp_port, every printer also answers SNMP on that port, or on consecutive ones.
+    """
+
+    def __init__(self, count: int, config: StandInConfig, host: str = "127.0.0.1", port: int = 18080,
+                 spread_addresses: bool = False, snmp_port: int | None = None) -> None:
+        self.printers = [StandInPrinter(f"BENCH{index:05d}", config) for index in range(count)]
+        if spread_addresses:
+            self._addresses = [(f"127.0.{index // 250}.{index % 250 + 2}", port) for index in range(count)]
+        else:
+            self._addresses = [(host, port + index) for index in range(count)]
+        self.snmp_ports = []
+        if snmp_port is not None:
+            self.snmp_ports = [snmp_port if spread_addresses else snmp_port + index for index in range(count)]
+        self._runners: list[web.AppRunner] = []
+        self._transports: list[asyncio.DatagramTransport] = []
+
+    @property
+    def hosts(self) -> list[str]:
+        """Return the host of every printer as the integration expects it."""
+        return [address if port == 80 else f"{address}:{port}" for address, port in self._addresses]
+
+    @property
+    def ports(self) -> list[int]:
+        """Return the web interface port of every printer, which answers IPP as well."""
+        return [port for _, port in self._addresses]
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests served so far."""
+        return sum(printer.requests for printer in self.printers)
+
+    async def start(self) -> None:
+        for printer, (address, port) in zip(self.printers, self._addresses):
+            runner = web.AppRunner(printer.app(), access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, address, port).start()
+            self._runners.append(runner)
+
+        loop = asyncio.get_running_loop()
+        for printer, (address, _), snmp_port in zip(self.printers, self._addresses, self.snmp_ports):
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda printer=printer: SnmpAgent(printer), local_addr=(address, snmp_port)
+            )
+            self._transports.append(transport)
+
+    async def stop(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
+
+
+def _arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--printers", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--spread-addresses", action="store_true", help="one loopback address per printer")
+    parser.add_argument("--snmp-port", type=int, help="also answer SNMP, starting at this port")
+    add_config_arguments(parser)
+    return parser.parse_args()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of StandInConfig to a command line parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds before every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--padding", type=int, default=0, help="bytes of padding added to every page")
+    parser.add_argument("--events", type=int, default=1, help="entries on the events page")
+    parser.add_argument("--vary", action="store_true", help="change counters and toner on every poll")
+
+
+def config_from_arguments(arguments: argparse.Namespace) -> StandInConfig:
+    """Build a StandInConfig from parsed command line arguments."""
+    return StandInConfig(
+        latency=arguments.latency,
+        jitter=arguments.jitter,
+        error_rate=arguments.error_rate,
+        padding=arguments.padding,
+        events=arguments.events,
+        vary=arguments.vary,
+    )
+
+
+async def _serve(arguments: argparse.Namespace) -> None:
+    fleet = StandInFleet(
+        arguments.printers, config_from_arguments(arguments), arguments.host, arguments.port, arguments.spread_addresses,
+        arguments.snmp_port
+    )
+    await fleet.start()
+    print(f"Serving {len(fleet.printers)} printers on {fleet.hosts[0]} to {fleet.hosts[-1]}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_serve(_arguments()))
+    except KeyboardInterrupt:
+        pass
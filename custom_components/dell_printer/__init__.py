@@ -1,138 +1,606 @@
 """The Dell printer component."""
 from __future__ import annotations
-from typing import Dict
-from datetime import timedelta
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from collections import Counter, deque
+from datetime import datetime, timedelta
 
-from dell_printer_parser.printer_parser import DellPrinterParser
-from aiohttp.client_exceptions import ClientConnectorError
+import asyncio
+import time
 
+from aiohttp import ClientError
+import voluptuous as vol
+
+from .addresses import AddressSet
+from .breaker import CircuitBreaker
+from .client import PARSE_ERRORS, DellPrinterClient
 from .const import *
+from .fleet import DellPrinterFleet
+from .history import ConsumptionHistory
+from .instrumentation import PollSample, percentile
+from .snapshot import PrinterSnapshot
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL
 from homeassistant.config_entries import ConfigEntry
 
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+# printers are set up from the UI, the pool that parses the pages of all of them is sized in configuration.yaml
+CONFIG_SCHEMA = vol.Schema({
+    vol.Optional(DOMAIN): vol.Schema({
+        vol.Optional(CONF_PARSE_WORKERS, default=PARSE_WORKERS): vol.All(cv.positive_int, vol.Range(min=1, max=16)),
+    }),
+}, extra=vol.ALLOW_EXTRA)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services of the component."""
+
+    hass.data.setdefault(DOMAIN, {})[CONF_PARSE_WORKERS] = config.get(DOMAIN, {}).get(CONF_PARSE_WORKERS, PARSE_WORKERS)
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Refresh the targeted printers, or all of them without a target."""
+
+        entry_ids = await async_extract_config_entry_ids(hass, call)
+        coordinators = [
+            hass.data[DOMAIN][entry.entry_id]
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id in hass.data.get(DOMAIN, {}) and (not entry_ids or entry.entry_id in entry_ids)
+        ]
+        await asyncio.gather(*(coordinator.async_request_fresh_data() for coordinator in coordinators))
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_refresh, schema=vol.Schema(cv.TARGET_SERVICE_FIELDS))
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Setup a Dell printer from a config entry."""
 
+    started = time.perf_counter()
+
     # get the host address
     host = entry.data[CONF_HOST]
 
-    # setup the parser
-    update_interval = entry.data[CONF_SCAN_INTERVAL]
-    session = async_get_clientsession(hass)
-    printer = DellPrinterParser(session, host)    
-    try:
-        await printer.load_data()
-    except ClientConnectorError as e:
-        _LOGGER.error(f"Cannot load data with error: {e}")
-        return False
-
-    # setup a coordinator
-    coordinator = DellDataUpdateCoordinator(hass, _LOGGER, printer, timedelta(seconds=update_interval))
-
-    # refresh coordinator for the first time to load initial data
-    await coordinator.async_config_entry_first_refresh()
-    
-    # store coordinator
+    # all printers share one poll scheduler
     hass.data.setdefault(DOMAIN, {})
+    fleet = hass.data[DOMAIN].get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DOMAIN][DATA_FLEET] = DellPrinterFleet(
+            hass, FLEET_MAX_CONCURRENT_POLLS, hass.data[DOMAIN].get(CONF_PARSE_WORKERS, PARSE_WORKERS)
+        )
+
+    # setup the parser, options override the interval given at setup
+    update_interval = entry.options.get(CONF_SCAN_INTERVAL, entry.data[CONF_SCAN_INTERVAL])
+    client = await _async_create_client(fleet, host, entry)
+    client.parse_pool = fleet.parse_pool
+    client.streaming = entry.options.get(CONF_STREAMING, False)
+
+    # page and toner consumption is kept on disk until it is imported into long-term statistics
+    history = None
+    if entry.options.get(CONF_CONSUMPTION_HISTORY, True):
+        history = ConsumptionHistory(hass, _get_history_store(hass, entry), entry.title, entry.unique_id or entry.entry_id)
+        await history.async_load()
+        entry.async_on_unload(
+            async_track_utc_time_change(hass, history.async_import, minute=HISTORY_IMPORT_MINUTE, second=0)
+        )
+
+    # the host and all addresses the printer announced, the fastest one is used until it fails
+    addresses = AddressSet([host, *entry.data.get(CONF_ADDRESSES, [])])
+
+    # setup a coordinator that keeps its last good data in storage
+    coordinator = DellDataUpdateCoordinator(
+        hass, _LOGGER, client, timedelta(seconds=update_interval), _get_store(hass, entry), fleet, history, addresses
+    )
+    coordinator.options = dict(entry.options)
+    if entry.options.get(CONF_ADAPTIVE_POLLING):
+        coordinator.set_adaptive(
+            timedelta(seconds=entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)),
+            timedelta(seconds=entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL))
+        )
+
+    # entities come up from a stored snapshot until the first scheduled poll replaces it,
+    # if nothing is stored yet, wait for the printer to load initial data
+    if not await coordinator.async_restore():
+        await coordinator.async_config_entry_first_refresh()
+
+    # store coordinator and hand it to the scheduler
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    fleet.async_add(entry, coordinator)
+
+    # reload when the options change
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # setup sensors, all platforms at once
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # setup sensors
-    for p in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, p)
+    coordinator.setup_seconds = time.perf_counter() - started
+    if coordinator.setup_seconds > SETUP_TIME_BUDGET:
+        _LOGGER.warning(
+            f"Setting up {host} took {coordinator.setup_seconds:.3f}s, over the budget of {SETUP_TIME_BUDGET}s"
         )
-    # hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+    else:
+        _LOGGER.debug(f"Set up {host} in {coordinator.setup_seconds:.3f}s")
 
     return True
 
 
+async def _async_create_client(fleet: DellPrinterFleet, host: str, entry: ConfigEntry) -> DellPrinterClient:
+    """Return the client of the backend chosen in the options."""
+
+    fast_extractor = entry.options.get(CONF_FAST_EXTRACTOR, False)
+    backend = entry.options.get(CONF_BACKEND, BACKEND_HTML)
+    if backend == BACKEND_SNMP:
+        # pysnmp is only needed by entries that use it
+        from .snmp import DellPrinterSnmpClient
+        engine = await fleet.async_get_snmp_engine()
+        community = entry.options.get(CONF_SNMP_COMMUNITY, DEFAULT_SNMP_COMMUNITY)
+        return DellPrinterSnmpClient(fleet.session, host, engine, community, fast_extractor)
+    if backend == BACKEND_IPP:
+        from .ipp import DellPrinterIppClient
+        return DellPrinterIppClient(fleet.session, host, fast_extractor)
+    return DellPrinterClient(fleet.session, host, fast_extractor)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
-    
-    for p in PLATFORMS:
-        await hass.config_entries.async_forward_entry_unload(entry, p)
 
-    hass.data[DOMAIN].pop(entry.entry_id)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        # a reload restores the pages printed today from the store, which may not be written yet
+        await hass.data[DOMAIN][entry.entry_id].async_save()
 
-    return True
+        fleet = hass.data[DOMAIN][DATA_FLEET]
+        fleet.async_remove(entry)
+        hass.data[DOMAIN].pop(entry.entry_id)
+
+        # another printer provides the aggregate sensors, if this one did
+        fleet.aggregates.async_remove_provider(entry.entry_id)
+
+    return unload_ok
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed, take over new addresses without reloading."""
+
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and coordinator.options == entry.options:
+        coordinator.addresses.update([entry.data[CONF_HOST], *entry.data.get(CONF_ADDRESSES, [])])
+        return
+
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot and history of a deleted config entry."""
+
+    await _get_store(hass, entry).async_remove()
+    await _get_history_store(hass, entry).async_remove()
+
+
+def _get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the storage for the last known data of a config entry."""
+
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id))
+
+
+def _get_history_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the storage for the consumption history of a config entry."""
+
+    return Store(hass, STORAGE_VERSION, HISTORY_STORAGE_KEY.format(entry_id=entry.entry_id))
 
 
 class DellDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Dell data from the printer."""
 
-    def __init__(self, hass: HomeAssistant, _LOGGER, printer: DellPrinterParser, update_interval: timedelta) -> None:
+    def __init__(self, hass: HomeAssistant, _LOGGER, client: DellPrinterClient, update_interval: timedelta, store: Store, fleet: DellPrinterFleet, history: Optional[ConsumptionHistory] = None, addresses: Optional[AddressSet] = None) -> None:
         """Initialize."""
 
-        self.printer = printer
-        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
+        self.client = client
+        self._store = store
+        self.history = history
+        self.addresses = addresses
+
+        # options the entry was set up with, to tell option changes from address updates
+        self.options: Dict[str, Any] = {}
+
+        # the fleet schedules the polls, so the coordinator does not run its own timer
+        self.fleet = fleet
+        self.poll_interval = update_interval
+        self.poll_due: Optional[float] = None
+        self.queue_delay = 0.0
+
+        # seconds the setup of the config entry took, None until it finished
+        self.setup_seconds: Optional[float] = None
+
+        # stops scraping a printer that keeps failing until a probe finds it again
+        self.breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, timedelta(seconds=BREAKER_BACKOFF), timedelta(seconds=BREAKER_MAX_BACKOFF)
+        )
+
+        # timings of the last polls
+        self.samples: Deque[PollSample] = deque(maxlen=POLL_SAMPLES)
+
+        # floor and ceiling of the poll interval in adaptive mode, None polls at a fixed interval
+        self._adaptive_range: Optional[Tuple[timedelta, timedelta]] = None
+        self._active = False
+
+        # True while the data is a restored snapshot that no refresh has confirmed yet
+        self.stale = False
+
+        # page counts of the printer for the pages printed today, as stored with the snapshot
+        self.stored_pages: Optional[Tuple[str, int, int]] = None
+
+        # data keys of page groups that failed to load on their last attempt
+        self.stale_keys: frozenset = frozenset()
+
+        # data keys changed by the last update, None wakes all listeners
+        self._changed_keys: Optional[Set[str]] = None
+
+        # status and events follow the scan interval (None), the other pages poll on slower tiers
+        self._tier_intervals = {
+            PRINTER_INFORMATION: timedelta(seconds=INFORMATION_INTERVAL),
+            PRINTER_PRINT_VOLUME: max(update_interval, timedelta(seconds=PRINT_VOLUME_INTERVAL)),
+            PRINTER_STATUS: None,
+            PRINTER_EVENTS: None,
+        }
+        self._last_loaded: Dict[str, datetime] = {}
+        self._force_full = True
+
+        # the refresh in flight and when the last one finished (loop time), shared by callers that overlap
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refreshed_at: Optional[float] = None
+
+        super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=None)
+
+
+    async def async_refresh(self) -> None:
+        """Refresh data, joining a refresh in flight instead of scraping the printer twice."""
+
+        if self._refresh_task is None:
+            self._refresh_task = self.hass.async_create_task(self._async_shared_refresh())
+        else:
+            # the slot of a joining scheduled poll does not apply to the next one
+            self.poll_due = None
+        await asyncio.shield(self._refresh_task)
+
+
+    async def async_request_fresh_data(self) -> None:
+        """Refresh on demand, sharing a refresh in flight or one that finished within the debounce window."""
 
+        if self._refresh_task is None and self._refreshed_at is not None:
+            if self.hass.loop.time() - self._refreshed_at < REFRESH_DEBOUNCE:
+                _LOGGER.debug(f"Data of {self.client.host} is fresh, skipping the refresh")
+                return
+        await self.async_refresh()
 
-    async def _async_update_data(self) -> Dict:
-        """Update data via library."""
 
+    async def _async_shared_refresh(self) -> None:
         try:
-            """Ask the library to reload fresh data."""
-            await self.printer.load_data()
-        except (ConnectionError) as error:
-            raise UpdateFailed(error) from error
-
-        """Stick the data into a dictionary and return this for further usage."""
-        data = {}
-
-        data[MODEL_NAME] = self.printer.information.modelName
-        data[DELL_SERVICE_TAG_NUMBER] = self.printer.information.dellServiceTagNumber
-        data[ASSET_TAG_NUMBER] = self.printer.information.assetTagNumber
-        data[PRINTER_SERIAL_NUMBER] = self.printer.information.printerSerialNumber
-        data[MEMORY_CAPACITY] = self.printer.information.memoryCapacity
-        data[PROCESSOR_SPEED] = self.printer.information.processorSpeed
-        data[FIRMWARE_VERSION] = self.printer.information.firmwareVersion
-        data[NETWORK_FIRMWARE_VERSION] = self.printer.information.networkFirmwareVersion
-        data[CYAN_LEVEL] = self.printer.status.cyanLevel
-        data[MAGENTA_LEVEL] = self.printer.status.magentaLevel
-        data[YELLOW_LEVEL] = self.printer.status.yellowLevel
-        data[BLACK_LEVEL] = self.printer.status.blackLevel
-        data[MULTI_PURPOSE_FEEDER_STATUS] = self.printer.status.multiPurposeFeederStatus
-        data[MULTI_PURPOSE_FEEDER_CAPACITY] = self.printer.status.multiPurposeFeederCapacity
-        data[MULTI_PURPOSE_FEEDER_SIZE] = self.printer.status.multiPurposeFeederSize
-        data[OUTPUT_TRAY_STATUS] = self.printer.status.outputTrayStatus
-        data[OUTPUT_TRAY_CAPACITY] = self.printer.status.outputTrayCapacity
-        data[REAR_COVER_STATUS] = self.printer.status.rearCoverStatus
-        data[ADF_COVER_STATUS] = self.printer.status.adfCoverStatus
-        data[PRINTER_TYPE] = self.printer.status.printerType
-        data[PRINTING_SPEED] = self.printer.status.printingSpeed
-        data[PRINTER_PAGE_COUNT] = self.printer.printVolume.printerPageCount
-        data[PAPER_USED_LETTER] = self.printer.printVolume.paperUsedLetter
-        data[PAPER_USED_A5] = self.printer.printVolume.paperUsedA5
-        data[PAPER_USED_B5] = self.printer.printVolume.paperUsedB5
-        data[PAPER_USED_A4] = self.printer.printVolume.paperUsedA4
-        data[PAPER_USED_EXECUTIVE] = self.printer.printVolume.paperUsedExecutive
-        data[PAPER_USED_FOLIO] = self.printer.printVolume.paperUsedFolio
-        data[PAPER_USED_LEGAL] = self.printer.printVolume.paperUsedLegal
-        data[PAPER_USED_ENVELOPE] = self.printer.printVolume.paperUsedEnvelope
-        data[PAPER_USED_MONARCH] = self.printer.printVolume.paperUsedMonarch
-        data[PAPER_USED_DL] = self.printer.printVolume.paperUsedDL
-        data[PAPER_USED_C5] = self.printer.printVolume.paperUsedC5
-        data[PAPER_USED_OTHERS] = self.printer.printVolume.paperUsedOthers
-        data[EVENT_LOCATION] = self.printer.events.eventLocation
-        data[EVENT_DETAILS] = self.printer.events.eventDetails
+            await super().async_refresh()
+        finally:
+            self._refreshed_at = self.hass.loop.time()
+            self._refresh_task = None
+
+
+    async def _async_update_data(self) -> PrinterSnapshot:
+        """Update data via library, reloading only the page groups that are due."""
+
+        # scheduled polls count their delay from the slot they were due in
+        requested = self.poll_due or self.hass.loop.time()
+        self.poll_due = None
+
+        async with self.fleet.semaphore:
+            self.queue_delay = self.hass.loop.time() - requested
+            _LOGGER.debug(f"Polling {self.client.host} after {self.queue_delay:.3f}s in queue")
+
+            now = dt_util.utcnow()
+            groups = self._due_groups(now)
+            sample = PollSample(now.isoformat(), self.queue_delay)
+            started = time.perf_counter()
+
+            # a failed poll may mean the printer rebooted, so the next one reloads everything
+            self._force_full = True
+            self._changed_keys = None
+
+            """Merge the fresh page groups into the previous data."""
+            updates = {}
+            try:
+                if self.addresses:
+                    self.client.set_host(await self.addresses.async_select(self.client.async_probe))
+                if self.breaker.state == BREAKER_OPEN:
+                    # a single cheap request tells whether the printer is back, before scraping all pages
+                    await self.client.async_probe()
+                    self.breaker.record_probe()
+                    self._async_breaker_changed()
+                if PRINTER_INFORMATION in groups:
+                    # the pages compare English texts, so the language is reset along with the slow tier,
+                    # before any page of the poll is requested
+                    await asyncio.wait_for(self.client.async_set_language(), PAGE_TIMEOUT)
+                loaded, failed = await self._async_load_groups(groups, sample)
+                for group_data in loaded.values():
+                    updates.update(group_data)
+
+                # a partial poll keeps the previous data of the failed pages, without previous data it fails
+                if failed and (not loaded or self.data is None):
+                    raise next(iter(failed.values()))
+                sample.success = not failed
+            except (ConnectionError, asyncio.TimeoutError, ClientError, *PARSE_ERRORS) as error:
+                self._record_failure()
+                # the next poll races all addresses again, failing over to one that answers
+                if self.addresses:
+                    self.addresses.invalidate()
+                raise UpdateFailed(error) from error
+            finally:
+                sample.total = time.perf_counter() - started
+                self.samples.append(sample)
+
+        # the snapshot of this poll, with its derived values computed once
+        data = self.data.replace(updates) if self.data else PrinterSnapshot(updates)
+
+        for group in loaded:
+            self._last_loaded[group] = now
+        self._force_full = False
+
+        # keys of failed pages stay stale until their page loads again
+        stale_keys = set(self.stale_keys)
+        for group in loaded:
+            stale_keys.difference_update(GROUP_KEYS[group])
+        for group, error in failed.items():
+            stale_keys.update(GROUP_KEYS[group])
+            _LOGGER.info(f"Page group {group} of {self.client.host} failed, keeping its previous data: {error!r}")
+        stale_changed = stale_keys ^ self.stale_keys
+        self.stale_keys = frozenset(stale_keys)
+
+        if self.breaker.state != BREAKER_CLOSED:
+            _LOGGER.info(f"Printer {self.client.host} is reachable again, resuming polls")
+        self.breaker.record_success()
+
+        if self._adaptive_range:
+            self._adapt_interval(data)
+
+        if self.history:
+            self.history.record(now, data)
+
+        self.fleet.aggregates.async_update(data[PRINTER_SERIAL_NUMBER], data)
+
+        # the event log of the previous snapshot is the cursor, also across restarts
+        if self.data is not None and data[EVENT_LOG] != self.data[EVENT_LOG]:
+            self._fire_new_events(self.data[EVENT_LOG], data[EVENT_LOG])
+
+        # after a restore or a failure all entities refresh, otherwise only those with changed keys
+        if self.stale or not self.last_update_success or self.data is None:
+            changed = None
+        else:
+            # entities whose keys turn stale or fresh update their attributes
+            changed = data.changed_keys(self.data) | stale_changed
+
+        # persist the last good data, coalescing writes of consecutive polls
+        if changed is None or changed:
+            self._store.async_delay_save(self._stored_data, STORAGE_SAVE_DELAY)
+        self.stale = False
+        self._changed_keys = changed
 
         return data
 
 
+    async def _async_load_groups(
+        self, groups: List[str], sample: PollSample
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, BaseException]]:
+        """Load page groups concurrently and return the data of the loaded groups and the errors of the failed ones."""
+
+        async def async_load(group: str) -> Dict[str, Any]:
+            return await asyncio.wait_for(self.client.async_load(group, sample), PAGE_TIMEOUT)
+
+        tasks = {group: asyncio.create_task(async_load(group)) for group in groups}
+        if not tasks:
+            return {}, {}
+
+        # the poll takes as long as its slowest page, but never longer than the deadline
+        _, pending = await asyncio.wait(tasks.values(), timeout=POLL_DEADLINE)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        loaded, failed = {}, {}
+        for group, task in tasks.items():
+            if task in pending:
+                failed[group] = asyncio.TimeoutError(f"{group} missed the poll deadline")
+            elif task.exception() is None:
+                loaded[group] = task.result()
+            elif isinstance(task.exception(), (ConnectionError, asyncio.TimeoutError, ClientError, *PARSE_ERRORS)):
+                failed[group] = task.exception()
+            else:
+                raise task.exception()
+        return loaded, failed
+
+
+    def _fire_new_events(self, previous: Tuple, current: Tuple) -> None:
+        """Fire an event for every entry of the event log that was not there before."""
+
+        # compare as tuples, the stored cursor comes back from JSON as lists
+        new = Counter(tuple(entry) for entry in current) - Counter(tuple(entry) for entry in previous)
+        for (location, details), count in new.items():
+            for _ in range(count):
+                self.hass.bus.async_fire(EVENT_PRINTER_EVENT, {
+                    PRINTER_SERIAL_NUMBER: self.data[PRINTER_SERIAL_NUMBER],
+                    EVENT_LOCATION: location,
+                    EVENT_DETAILS: details,
+                })
+
+
+    def _record_failure(self) -> None:
+        """Count a failed poll on the circuit breaker."""
+
+        state = self.breaker.state
+        self.breaker.record_failure()
+        if state != BREAKER_OPEN and self.breaker.state == BREAKER_OPEN:
+            _LOGGER.info(
+                f"Printer {self.client.host} failed {self.breaker.failures} polls in a row, "
+                f"probing it again in {self.next_interval.total_seconds():.0f}s"
+            )
+        if self.breaker.state != state:
+            self._async_breaker_changed()
+
+
+    @callback
+    def _async_breaker_changed(self) -> None:
+        """Update all listeners, as Home Assistant only does so when a poll fails after a success or back."""
+
+        # the circuit breaker state is an attribute of the printer entity
+        self._changed_keys = None
+        self.async_update_listeners()
+
+
+    @property
+    def next_interval(self) -> timedelta:
+        """Return the delay until the next poll, backing off while the circuit breaker is open."""
+
+        if self.breaker.state == BREAKER_OPEN:
+            return max(self.poll_interval, self.breaker.backoff)
+        return self.poll_interval
+
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose data keys changed."""
+
+        changed = self._changed_keys
+        self._changed_keys = None
+        for update_callback, data_keys in list(self._listeners.values()):
+            if changed is None or data_keys is None or not changed.isdisjoint(data_keys):
+                update_callback()
+
+
+    def poll_latency(self, percent: int) -> Optional[float]:
+        """Return a percentile of the duration of the last successful polls in seconds."""
+
+        return percentile([sample.total for sample in self.samples if sample.success], percent)
+
+
+    @property
+    def bytes_per_poll(self) -> Optional[float]:
+        """Return the mean size of the pages received by the last successful polls."""
+
+        sizes = [sample.size for sample in self.samples if sample.success]
+        return sum(sizes) / len(sizes) if sizes else None
+
+
+    async def async_restore(self) -> bool:
+        """Restore the last known data, marked stale until the next refresh."""
+
+        stored = await self._store.async_load()
+
+        # snapshots of older versions lack some keys, so they wait for fresh data
+        if not stored or not set(DATA_KEYS) <= stored.keys():
+            return False
+
+        self.data = PrinterSnapshot(stored)
+        self.stored_pages = stored.get(STORED_PAGES_TODAY)
+        self.stale = True
+        return True
+
+
+    async def async_save(self) -> None:
+        """Store the last known data right away, instead of with the next delayed write."""
+
+        await self._store.async_save(self._stored_data())
+
+
+    def _stored_data(self) -> Dict[str, Any]:
+        """Return the last known data with the page counts of the pages printed today."""
+
+        return {
+            **self.data.as_dict(),
+            STORED_PAGES_TODAY: self.fleet.aggregates.pages(self.data[PRINTER_SERIAL_NUMBER]),
+        }
+
+
+    def set_adaptive(self, floor: timedelta, ceiling: timedelta) -> None:
+        """Poll between floor and ceiling depending on printer activity."""
+
+        self._adaptive_range = (floor, ceiling)
+        self.poll_interval = min(max(self.poll_interval, floor), ceiling)
+
+
+    def _adapt_interval(self, data: PrinterSnapshot) -> None:
+        """Poll at the floor while the printer is busy, back off while it is idle."""
+
+        floor, ceiling = self._adaptive_range
+        previous = self.data or {}
+
+        # page count only moves while printing, events and covers show jams and open doors
+        self._active = (
+            data.get(PRINTER_PAGE_COUNT) != previous.get(PRINTER_PAGE_COUNT)
+            or data.error
+            or data[REAR_COVER_STATUS] == "Open"
+            or data[ADF_COVER_STATUS] == "Open"
+        )
+
+        if self._active:
+            self.poll_interval = floor
+        else:
+            self.poll_interval = min(self.poll_interval * ADAPTIVE_BACKOFF_FACTOR, ceiling)
+
+
+    @property
+    def subscribed_groups(self) -> Set[str]:
+        """Return the page groups that enabled entities or the coordinator itself read from."""
+
+        # fired events and the error state come from the events page
+        groups = {PRINTER_EVENTS}
+        if self.history:
+            groups.update(KEY_GROUPS[key] for key in [*TONER_LEVELS, PRINTER_PAGE_COUNT])
+        if self._adaptive_range:
+            groups.update(KEY_GROUPS[key] for key in [PRINTER_PAGE_COUNT, REAR_COVER_STATUS, ADF_COVER_STATUS])
+
+        # the listener contexts are the data keys of the entities, disabled entities do not listen
+        for context in self.async_contexts():
+            groups.update(KEY_GROUPS[key] for key in context if key in KEY_GROUPS)
+        return groups
+
+
+    def _due_groups(self, now: datetime) -> List[str]:
+        """Return the subscribed page groups whose polling tier has elapsed."""
+
+        # a full reload also covers unsubscribed pages, as the information page restores the interface language
+        if self._force_full:
+            return list(PAGE_GROUPS)
+
+        subscribed = self.subscribed_groups
+        due = []
+        for group in PAGE_GROUPS:
+            if group not in subscribed:
+                # loaded on the first poll after an entity subscribes again
+                self._last_loaded.pop(group, None)
+                continue
+            interval = self._tier_intervals[group]
+            # adaptive polling follows the page count on every poll, as a print job may not change anything else,
+            # and backs off the poll interval itself while the printer is idle
+            if self._adaptive_range and group == PRINTER_PRINT_VOLUME:
+                interval = None
+            last_loaded = self._last_loaded.get(group)
+            if interval is None or last_loaded is None or now - last_loaded >= interval:
+                due.append(group)
+        return due
+
+
 class DellPrinterEntity(CoordinatorEntity):
 
-    def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator)
+    def __init__(self, coordinator: DellDataUpdateCoordinator, data_keys: Optional[List[str]]):
+        # the data keys are the listener context, so the entity only wakes when one of them changes,
+        # entities without data keys wake on every update
+        super().__init__(coordinator, frozenset(data_keys) if data_keys is not None else None)
         self._serialNumber = coordinator.data[PRINTER_SERIAL_NUMBER]
         self._modelName = coordinator.data[MODEL_NAME]
         self._firmware = coordinator.data[FIRMWARE_VERSION]
@@ -154,4 +622,17 @@ class DellPrinterEntity(CoordinatorEntity):
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self._available
\ No newline at end of file
+        return self._available
+
+    @property
+    def printer_attributes(self) -> Dict[str, Any]:
+        """Return the entity specific state attributes."""
+        return {}
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return state attributes, flagging data restored from the last snapshot."""
+        attrs = dict(self.printer_attributes)
+        if self.coordinator.stale or not self.coordinator.stale_keys.isdisjoint(self.coordinator_context or ()):
+            attrs[ATTR_STALE] = True
+        return attrs or None
\ No newline at end of file
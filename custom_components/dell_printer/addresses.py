@@ -0,0 +1,83 @@
+"""Address selection of the Dell printer component."""
+from __future__ import annotations
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import asyncio
+import ipaddress
+
+from .const import *
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def url_host(address: str) -> str:
+    """Return an address as the host of a URL, which puts IPv6 addresses in brackets."""
+    try:
+        if ipaddress.ip_address(address).version == 6:
+            return f"[{address}]"
+    except ValueError:
+        pass
+    return address
+
+
+class AddressSet:
+    """All addresses a printer answers on, with the fastest one that worked cached.
+
+    The addresses are raced once (happy eyeballs, RFC 8305): they are tried in order,
+    each one a short delay after the previous, or right after it failed, and the first
+    that answers wins. The winner is kept until a poll fails, then the next poll races
+    the addresses again.
+    """
+
+    def __init__(self, addresses: Iterable[str]) -> None:
+        """Initialize."""
+        self.addresses: List[str] = []
+        self.current: Optional[str] = None
+        self.update(addresses)
+
+    def update(self, addresses: Iterable[str]) -> None:
+        """Replace the addresses, keeping the current one if it is still announced."""
+        self.addresses = list(dict.fromkeys(url_host(address) for address in addresses))
+        if self.current not in self.addresses:
+            self.current = None
+
+    def invalidate(self) -> None:
+        """Forget the current address, so the next selection races all of them again."""
+        self.current = None
+
+    async def async_select(self, probe: Callable[[str], Awaitable]) -> str:
+        """Return the current address, racing the addresses with the probe if there is none."""
+
+        if self.current is not None:
+            return self.current
+        if len(self.addresses) == 1:
+            self.current = self.addresses[0]
+            return self.current
+
+        remaining = list(self.addresses)
+        tasks: Dict[asyncio.Task, str] = {}
+        error: Optional[BaseException] = None
+        try:
+            while remaining or tasks:
+                if remaining:
+                    address = remaining.pop(0)
+                    tasks[asyncio.create_task(probe(address))] = address
+
+                # the next address starts after the delay, or as soon as an attempt failed
+                done, _ = await asyncio.wait(
+                    tasks, timeout=HAPPY_EYEBALLS_DELAY if remaining else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    address = tasks.pop(task)
+                    if task.exception() is None:
+                        _LOGGER.debug(f"Selected address {address} of {self.addresses}")
+                        self.current = address
+                        return address
+                    error = task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        raise ConnectionError(f"None of {self.addresses} answered: {error!r}")
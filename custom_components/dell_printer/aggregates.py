@@ -0,0 +1,241 @@
+"""Fleet wide aggregates of the Dell printer component, adjusted by every poll."""
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util import dt as dt_util
+
+from .const import *
+from .snapshot import PrinterSnapshot
+
+
+class IndexedMinHeap:
+    """Binary min-heap of values by key, with the position of every key indexed.
+
+    Setting or removing the value of any key takes O(log n), the minimum is read in O(1).
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._heap: List[Tuple[Any, Hashable]] = []
+        self._index: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Add a key or change its value."""
+        position = self._index.get(key)
+        if position is None:
+            self._heap.append((value, key))
+            self._index[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+
+        previous = self._heap[position][0]
+        self._heap[position] = (value, key)
+        if value < previous:
+            self._sift_up(position)
+        elif value > previous:
+            self._sift_down(position)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a key, if it is there."""
+        position = self._index.pop(key, None)
+        if position is None:
+            return
+
+        last = self._heap.pop()
+        if position == len(self._heap):
+            return
+        self._heap[position] = last
+        self._index[last[1]] = position
+        self._sift_up(position)
+        self._sift_down(self._index[last[1]])
+
+    def min(self) -> Optional[Tuple[Hashable, Any]]:
+        """Return the key with the lowest value and its value, None if the heap is empty."""
+        if not self._heap:
+            return None
+        value, key = self._heap[0]
+        return key, value
+
+    def _move(self, position: int, entry: Tuple[Any, Hashable]) -> None:
+        self._heap[position] = entry
+        self._index[entry[1]] = position
+
+    def _sift_up(self, position: int) -> None:
+        entry = self._heap[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if not entry[0] < self._heap[parent][0]:
+                break
+            self._move(position, self._heap[parent])
+            position = parent
+        self._move(position, entry)
+
+    def _sift_down(self, position: int) -> None:
+        entry = self._heap[position]
+        size = len(self._heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._heap[child + 1][0] < self._heap[child][0]:
+                child += 1
+            if not self._heap[child][0] < entry[0]:
+                break
+            self._move(position, self._heap[child])
+            position = child
+        self._move(position, entry)
+
+
+class FleetAggregates:
+    """Lowest toner level, pages printed today and printers in error across all printers.
+
+    Every poll adjusts the aggregates by the change of its own printer, the toner
+    levels in an indexed min-heap and the others as running totals, so an update
+    costs O(log n) in the number of printers instead of a pass over all of them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        # (serial number, toner level key) -> level
+        self._toner = IndexedMinHeap()
+
+        # serial number -> (local date, page count at the start of the day, last page count)
+        self._pages: Dict[str, Tuple[str, int, int]] = {}
+        self._day = dt_util.now().date().isoformat()
+        self.pages_today = 0
+
+        # serial numbers of the printers reporting an error
+        self._errors: Set[str] = set()
+
+        # config entry that provides the aggregate sensors, and how every loaded entry would add them
+        self.owner: Optional[str] = None
+        self._providers: Dict[str, Callable[[], None]] = {}
+
+        self._listeners: Dict[CALLBACK_TYPE, str] = {}
+
+    @property
+    def lowest_toner(self) -> Optional[Tuple[str, str, int]]:
+        """Return the serial number, the level key and the level of the lowest toner, None without printers."""
+        lowest = self._toner.min()
+        if lowest is None:
+            return None
+        (serial, key), level = lowest
+        return serial, key, level
+
+    @property
+    def printers_in_error(self) -> int:
+        """Return the number of printers reporting an error."""
+        return len(self._errors)
+
+    def pages(self, serial: str) -> Optional[Tuple[str, int, int]]:
+        """Return the date, the page count at the start of that day and the last page count of a printer, to store."""
+        return self._pages.get(serial)
+
+    @callback
+    def async_update(self, serial: str, data: PrinterSnapshot, stored_pages: Optional[Tuple[str, int, int]] = None) -> None:
+        """Adjust the aggregates to the data of one printer, the first time possibly from its stored page counts."""
+
+        lowest, pages_today, errors = self.lowest_toner, self.pages_today, self.printers_in_error
+
+        for key in TONER_LEVELS:
+            self._toner.set((serial, key), data[key])
+
+        # a printer counts from its last page count of the previous day, or its first one
+        count = data[PRINTER_PAGE_COUNT]
+        previous = self._pages.get(serial)
+        if previous is not None and previous[0] == self._day:
+            self.pages_today -= previous[2] - previous[1]
+        day, start, last = previous or stored_pages or (self._day, count, count)
+        if day != self._day:
+            start = last
+        # a counter that went back, like on a replaced board, starts over
+        start = min(start, count)
+        self._pages[serial] = (self._day, start, count)
+        self.pages_today += count - start
+
+        if data.error:
+            self._errors.add(serial)
+        else:
+            self._errors.discard(serial)
+
+        self._async_notify(lowest, pages_today, errors)
+
+    @callback
+    def async_remove(self, serial: str) -> None:
+        """Drop a printer from the aggregates."""
+
+        lowest, pages_today, errors = self.lowest_toner, self.pages_today, self.printers_in_error
+
+        for key in TONER_LEVELS:
+            self._toner.remove((serial, key))
+        day, start, last = self._pages.pop(serial, (None, 0, 0))
+        if day == self._day:
+            self.pages_today -= last - start
+        self._errors.discard(serial)
+
+        self._async_notify(lowest, pages_today, errors)
+
+    @callback
+    def async_new_day(self, now: datetime) -> None:
+        """Start counting the pages of a new day, printers move their start on their next poll."""
+
+        pages_today = self.pages_today
+        self._day = now.date().isoformat()
+        self.pages_today = 0
+        self._async_notify(self.lowest_toner, pages_today, self.printers_in_error)
+
+    @callback
+    def async_add_provider(self, entry_id: str, provide: Callable[[], None]) -> None:
+        """Offer a config entry to add the aggregate sensors, the first one does so."""
+
+        self._providers[entry_id] = provide
+        if self.owner is None:
+            self.owner = entry_id
+            provide()
+
+    @callback
+    def async_remove_provider(self, entry_id: str) -> None:
+        """Withdraw an unloaded config entry, another loaded entry adds the sensors if it provided them."""
+
+        self._providers.pop(entry_id, None)
+        if self.owner != entry_id:
+            return
+        self.owner = None
+        for entry_id, provide in self._providers.items():
+            self.owner = entry_id
+            provide()
+            break
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, aggregate: str) -> Callable[[], None]:
+        """Call back when an aggregate changes, return a function to stop."""
+
+        self._listeners[update_callback] = aggregate
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(update_callback, None)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self, lowest: Optional[Tuple[str, str, int]], pages_today: int, errors: int) -> None:
+        """Call back the listeners of the aggregates that differ from the given previous values."""
+
+        changed = set()
+        if self.lowest_toner != lowest:
+            changed.add(AGGREGATE_LOWEST_TONER)
+        if self.pages_today != pages_today:
+            changed.add(AGGREGATE_PAGES_TODAY)
+        if self.printers_in_error != errors:
+            changed.add(AGGREGATE_PRINTERS_IN_ERROR)
+
+        for update_callback, aggregate in list(self._listeners.items()):
+            if aggregate in changed:
+                update_callback()
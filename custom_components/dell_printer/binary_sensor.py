@@ -1,4 +1,4 @@
-from typing import Callable, Any, Dict
+from typing import Callable, Any, Dict, List
 from custom_components.dell_printer import DellDataUpdateCoordinator, DellPrinterEntity
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.helpers.entity import EntityCategory
@@ -27,7 +27,7 @@ async def async_setup_entry(hass: HomeAssistantType, entry: ConfigEntry, async_a
     entities.append(PaperTrayStatus(coordinator))
     entities.append(PrinterInfo(coordinator))
     
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
     return True
 
 
@@ -35,7 +35,10 @@ class PrinterInfo(DellPrinterEntity, BinarySensorEntity):
     """Representation of the printer."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator)
+        super().__init__(coordinator, [
+            DELL_SERVICE_TAG_NUMBER, ASSET_TAG_NUMBER, PRINTER_SERIAL_NUMBER, MEMORY_CAPACITY, PROCESSOR_SPEED,
+            FIRMWARE_VERSION, NETWORK_FIRMWARE_VERSION, PRINTER_TYPE, PRINTING_SPEED, EVENT_LOCATION, EVENT_DETAILS
+        ])
         self._attr_unique_id = self._serialNumber + "_info"
         self._attr_name = self._modelName
         self.entity_id = "binary_sensor." + slugify(DEFAULT_NAME + " " + self._modelName)
@@ -44,7 +47,7 @@ class PrinterInfo(DellPrinterEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool:
-        return "ready" not in self.coordinator.data[EVENT_DETAILS].lower()
+        return self.coordinator.data.error
 
     @property
     def state(self) -> str:
@@ -62,7 +65,7 @@ class PrinterInfo(DellPrinterEntity, BinarySensorEntity):
             return "mdi:printer"
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
+    def printer_attributes(self) -> Dict[str, Any]:
         return {
             DELL_SERVICE_TAG_NUMBER: self.coordinator.data[DELL_SERVICE_TAG_NUMBER],
             ASSET_TAG_NUMBER: self.coordinator.data[ASSET_TAG_NUMBER],
@@ -74,15 +77,16 @@ class PrinterInfo(DellPrinterEntity, BinarySensorEntity):
             PRINTER_TYPE: self.coordinator.data[PRINTER_TYPE],
             PRINTING_SPEED: self.coordinator.data[PRINTING_SPEED],
             EVENT_LOCATION: self.coordinator.data[EVENT_LOCATION],
-            EVENT_DETAILS: self.coordinator.data[EVENT_DETAILS]
+            EVENT_DETAILS: self.coordinator.data[EVENT_DETAILS],
+            ATTR_CIRCUIT_BREAKER: self.coordinator.breaker.state
         }
 
 
 class Status(DellPrinterEntity, BinarySensorEntity):
     """Representation of a cover sensor."""
 
-    def __init__(self, coordinator: DellDataUpdateCoordinator, name: str):
-        super().__init__(coordinator)
+    def __init__(self, coordinator: DellDataUpdateCoordinator, name: str, data_keys: List[str]):
+        super().__init__(coordinator, data_keys)
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_device_class = "opening"
         self.lower_name = name.lower().replace(" ", "_")
@@ -103,7 +107,7 @@ class RearCoverStatus(Status):
     """Representation of a rear cover sensor."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Rear Cover")
+        super().__init__(coordinator, "Rear Cover", [REAR_COVER_STATUS])
         
     @property
     def is_on(self) -> bool:
@@ -118,7 +122,7 @@ class AdfCoverStatus(Status):
     """Representation of a ADF sensor."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "ADF Cover")
+        super().__init__(coordinator, "ADF Cover", [ADF_COVER_STATUS])
         
     @property
     def is_on(self) -> bool:
@@ -133,7 +137,7 @@ class OutputTrayStatus(Status):
     """Representation of an output tray sensor."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Output Tray")
+        super().__init__(coordinator, "Output Tray", [OUTPUT_TRAY_STATUS, OUTPUT_TRAY_CAPACITY])
         
     @property
     def is_on(self) -> bool:
@@ -144,7 +148,7 @@ class OutputTrayStatus(Status):
         return self.coordinator.data[OUTPUT_TRAY_STATUS]
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
+    def printer_attributes(self) -> Dict[str, Any]:
         self.attrs = {
             "capacity": self.coordinator.data[OUTPUT_TRAY_CAPACITY]
         }
@@ -163,7 +167,9 @@ class PaperTrayStatus(Status):
     """Representation of an output tray sensor."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Multi Purpose Feeder")
+        super().__init__(coordinator, "Multi Purpose Feeder", [
+            MULTI_PURPOSE_FEEDER_STATUS, MULTI_PURPOSE_FEEDER_CAPACITY, MULTI_PURPOSE_FEEDER_SIZE
+        ])
         
     @property
     def is_on(self) -> bool:
@@ -174,7 +180,7 @@ class PaperTrayStatus(Status):
         return self.coordinator.data[MULTI_PURPOSE_FEEDER_STATUS]
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
+    def printer_attributes(self) -> Dict[str, Any]:
         self.attrs = {
             "capacity": self.coordinator.data[MULTI_PURPOSE_FEEDER_CAPACITY],
             "size": self.coordinator.data[MULTI_PURPOSE_FEEDER_SIZE]
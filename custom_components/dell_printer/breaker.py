@@ -0,0 +1,43 @@
+"""Circuit breaker for unreachable printers."""
+from __future__ import annotations
+from datetime import timedelta
+
+from .const import *
+
+
+class CircuitBreaker:
+    """Stop scraping a printer after consecutive failures and back off exponentially.
+
+    closed: polls scrape the printer as usual.
+    open: the printer failed too often, the next poll only sends a probe.
+    half_open: the probe succeeded, the next scrape decides whether to close again.
+    """
+
+    def __init__(self, threshold: int, backoff: timedelta, max_backoff: timedelta) -> None:
+        """Initialize."""
+        self._threshold = threshold
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+
+    @property
+    def backoff(self) -> timedelta:
+        """Return the delay before the next probe, doubling with every failure past the threshold."""
+        exponent = max(0, self.failures - self._threshold)
+        return min(self._backoff * 2**exponent, self._max_backoff)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful scrape."""
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+
+    def record_probe(self) -> None:
+        """Let the next scrape through after a successful probe."""
+        self.state = BREAKER_HALF_OPEN
+
+    def record_failure(self) -> None:
+        """Count a failure and open the breaker once there were too many in a row."""
+        self.failures += 1
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self._threshold:
+            self.state = BREAKER_OPEN
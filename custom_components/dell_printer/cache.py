@@ -0,0 +1,116 @@
+"""Response cache for the pages of the printer web interface."""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import hashlib
+import time
+
+from aiohttp import hdrs
+
+
+@dataclass
+class CachedPage:
+    """Validators, body hash and parsed data of a page."""
+
+    digest: bytes
+    data: Dict[str, Any]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    # bytes at the start of the body the hash covers, when streaming stopped early, None for the whole body
+    length: Optional[int] = None
+
+
+class PageCache:
+    """Skip parsing of pages that did not change since the last poll."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._pages: Dict[str, CachedPage] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Return conditional request headers, if the printer sent validators."""
+        page = self._pages.get(url)
+        headers = {}
+        if page and page.etag:
+            headers[hdrs.IF_NONE_MATCH] = page.etag
+        if page and page.last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = page.last_modified
+        return headers
+
+    def not_modified(self, url: str) -> Dict[str, Any]:
+        """Return the cached data after a 304 response."""
+        self.hits += 1
+        return self._pages[url].data
+
+    def lookup(self, url: str, body: bytes, headers) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+        """Return the body hash and the cached data, if the body is unchanged."""
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        return digest, self.lookup_digest(url, digest, headers)
+
+    def prefix_length(self, url: str) -> Optional[int]:
+        """Return the length of the body start the hash of a streamed page covers, if it stopped early."""
+        page = self._pages.get(url)
+        return page.length if page else None
+
+    def lookup_digest(self, url: str, digest: bytes, headers) -> Optional[Dict[str, Any]]:
+        """Return the cached data, if the body hash is unchanged."""
+        page = self._pages.get(url)
+        if page is None or page.digest != digest:
+            self.misses += 1
+            return None
+
+        # refresh the validators, the printer may send new ones for the same content
+        page.etag = headers.get(hdrs.ETAG)
+        page.last_modified = headers.get(hdrs.LAST_MODIFIED)
+        self.hits += 1
+        return page.data
+
+    def store(self, url: str, digest: bytes, data: Dict[str, Any], headers, length: Optional[int] = None) -> None:
+        """Remember a freshly parsed page."""
+        self._pages[url] = CachedPage(
+            digest=digest,
+            data=data,
+            etag=headers.get(hdrs.ETAG),
+            last_modified=headers.get(hdrs.LAST_MODIFIED),
+            length=length,
+        )
+
+
+@dataclass
+class Identity:
+    """Serial number and model of a discovered printer, or why it was rejected."""
+
+    serial: Optional[str] = None
+    model: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class IdentityCache:
+    """Remember who answers at an address, so discovery only asks each printer once."""
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize."""
+        self._ttl = ttl
+        self._identities: Dict[str, Tuple[float, Identity]] = {}
+
+    def get(self, addresses: Iterable[str]) -> Optional[Identity]:
+        """Return the identity known for any of the addresses, None if it expired or is unknown."""
+        now = time.monotonic()
+        for address in addresses:
+            expires, identity = self._identities.get(address, (0.0, None))
+            if expires > now:
+                return identity
+        return None
+
+    def put(self, addresses: Iterable[str], identity: Identity, ttl: Optional[float] = None) -> None:
+        """Remember the identity for all addresses of a printer, for ttl seconds if given."""
+        now = time.monotonic()
+        self._identities = {
+            address: cached for address, cached in self._identities.items() if cached[0] > now
+        }
+        for address in addresses:
+            self._identities[address] = (now + (ttl or self._ttl), identity)
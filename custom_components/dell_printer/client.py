@@ -0,0 +1,403 @@
+"""Page group loading for the Dell printer component."""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+
+import asyncio
+import codecs
+import hashlib
+import importlib
+import time
+
+from aiohttp import ClientResponse, ClientSession, ClientTimeout
+from yarl import URL
+from dell_printer_parser.const import EVENTS_URL, INFORMATION_URL, PRINT_VOLUME_URL, STATUS_URL
+
+from .cache import PageCache
+from .const import *
+from .extractor import StreamingExtractor, extract_event_log, extract_page
+from .instrumentation import PageTiming, PollSample
+
+if TYPE_CHECKING:
+    from dell_printer_parser.printer_parser import DellPrinterParser
+
+    from .fleet import ParsePool
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# errors of parsing a truncated or error page, which fail the page group instead of the poll
+PARSE_ERRORS = (AttributeError, IndexError, KeyError, TypeError, ValueError)
+
+# the parser library module, imported on first use, once for all printers that need it at the same time
+_parser_module = None
+_parser_import_lock = asyncio.Lock()
+
+
+def _information_data(parser: DellPrinterParser) -> Dict[str, Any]:
+    """Map the information page onto data keys."""
+    information = parser.information
+    return {
+        MODEL_NAME: information.modelName,
+        DELL_SERVICE_TAG_NUMBER: information.dellServiceTagNumber,
+        ASSET_TAG_NUMBER: information.assetTagNumber,
+        PRINTER_SERIAL_NUMBER: information.printerSerialNumber,
+        MEMORY_CAPACITY: information.memoryCapacity,
+        PROCESSOR_SPEED: information.processorSpeed,
+        FIRMWARE_VERSION: information.firmwareVersion,
+        NETWORK_FIRMWARE_VERSION: information.networkFirmwareVersion,
+    }
+
+
+def _status_data(parser: DellPrinterParser) -> Dict[str, Any]:
+    """Map the status page onto data keys."""
+    status = parser.status
+    return {
+        CYAN_LEVEL: status.cyanLevel,
+        MAGENTA_LEVEL: status.magentaLevel,
+        YELLOW_LEVEL: status.yellowLevel,
+        BLACK_LEVEL: status.blackLevel,
+        MULTI_PURPOSE_FEEDER_STATUS: status.multiPurposeFeederStatus,
+        MULTI_PURPOSE_FEEDER_CAPACITY: status.multiPurposeFeederCapacity,
+        MULTI_PURPOSE_FEEDER_SIZE: status.multiPurposeFeederSize,
+        OUTPUT_TRAY_STATUS: status.outputTrayStatus,
+        OUTPUT_TRAY_CAPACITY: status.outputTrayCapacity,
+        REAR_COVER_STATUS: status.rearCoverStatus,
+        ADF_COVER_STATUS: status.adfCoverStatus,
+        PRINTER_TYPE: status.printerType,
+        PRINTING_SPEED: status.printingSpeed,
+    }
+
+
+def _print_volume_data(parser: DellPrinterParser) -> Dict[str, Any]:
+    """Map the print volume page onto data keys."""
+    print_volume = parser.printVolume
+    return {
+        PRINTER_PAGE_COUNT: print_volume.printerPageCount,
+        PAPER_USED_LETTER: print_volume.paperUsedLetter,
+        PAPER_USED_A5: print_volume.paperUsedA5,
+        PAPER_USED_B5: print_volume.paperUsedB5,
+        PAPER_USED_A4: print_volume.paperUsedA4,
+        PAPER_USED_EXECUTIVE: print_volume.paperUsedExecutive,
+        PAPER_USED_FOLIO: print_volume.paperUsedFolio,
+        PAPER_USED_LEGAL: print_volume.paperUsedLegal,
+        PAPER_USED_ENVELOPE: print_volume.paperUsedEnvelope,
+        PAPER_USED_MONARCH: print_volume.paperUsedMonarch,
+        PAPER_USED_DL: print_volume.paperUsedDL,
+        PAPER_USED_C5: print_volume.paperUsedC5,
+        PAPER_USED_OTHERS: print_volume.paperUsedOthers,
+    }
+
+
+def _events_data(parser: DellPrinterParser) -> Dict[str, Any]:
+    """Map the events page onto data keys."""
+    events = parser.events
+    return {
+        EVENT_LOCATION: events.eventLocation,
+        EVENT_DETAILS: events.eventDetails,
+    }
+
+
+# page group -> (page url, library extractor method, data mapping)
+GROUPS = {
+    PRINTER_INFORMATION: (INFORMATION_URL, "_extract_information", _information_data),
+    PRINTER_PRINT_VOLUME: (PRINT_VOLUME_URL, "_extract_print_volume", _print_volume_data),
+    PRINTER_STATUS: (STATUS_URL, "_extract_status", _status_data),
+    PRINTER_EVENTS: (EVENTS_URL, "_extract_events", _events_data),
+}
+
+
+def _parse(
+    group: str, text: str, fast: bool, parser: Optional[DellPrinterParser]
+) -> Tuple[Optional[Dict[str, Any]], float]:
+    """Return the data of a page and the seconds it took, None if only the library parser matches and it is not given.
+
+    Runs in a worker thread, so it only touches the page and the library parser state of its own group.
+    """
+
+    started = time.perf_counter()
+    data = extract_page(group, text) if fast else None
+    if data is None and parser is not None:
+        _, extract, mapping = GROUPS[group]
+        getattr(parser, extract)(text)
+        data = mapping(parser)
+    if data is not None and group == PRINTER_EVENTS:
+        # the library only reads the first of the current events
+        data[EVENT_LOG] = extract_event_log(text)
+    return data, time.perf_counter() - started
+
+
+def _encoding(response: ClientResponse) -> str:
+    """Return the declared encoding of a response, the body is not read as a whole to detect one."""
+    try:
+        return codecs.lookup(response.charset or "utf-8").name
+    except LookupError:
+        return "utf-8"
+
+
+def host_address(host: str) -> str:
+    """Return the address of a web interface host, without its port and IPv6 brackets."""
+    return URL("http://" + host).host
+
+
+async def _async_import_parser():
+    """Return the parser library, importing it in the executor the first time, as it pulls in BeautifulSoup."""
+
+    global _parser_module
+    if _parser_module is not None:
+        return _parser_module
+
+    async with _parser_import_lock:
+        if _parser_module is None:
+            started = time.perf_counter()
+            module = await asyncio.get_running_loop().run_in_executor(
+                None, importlib.import_module, "dell_printer_parser.printer_parser"
+            )
+            elapsed = time.perf_counter() - started
+            if elapsed > IMPORT_TIME_BUDGET:
+                _LOGGER.warning(f"Importing the parser library took {elapsed:.3f}s, over the budget of {IMPORT_TIME_BUDGET}s")
+            else:
+                _LOGGER.debug(f"Imported the parser library in {elapsed:.3f}s")
+            _parser_module = module
+    return _parser_module
+
+
+class DellPrinterClient:
+    """Load single page groups from the printer web interface."""
+
+    def __init__(self, session: ClientSession, host: str, fast_extractor: bool = False) -> None:
+        """Initialize."""
+        self.session = session
+        self.host = host
+        self.fast_extractor = fast_extractor
+        self.cache = PageCache()
+
+        # the library parser, created when a page first needs it
+        self._parser: Optional[DellPrinterParser] = None
+
+        # worker threads to parse pages in, shared by all printers, None parses on the event loop
+        self.parse_pool: Optional[ParsePool] = None
+
+        # read pages in chunks with the fast extractor and stop once it has all values
+        self.streaming = False
+
+        # bytes of the pages left unread by streaming since the client was created
+        self.skipped_bytes = 0
+
+        # pages the fast extractor does not match, they are read in full for the library
+        self._unstreamable: Set[str] = set()
+
+        # seconds spent parsing pages since the client was created
+        self.parse_seconds = 0.0
+
+    async def async_get_parser(self) -> DellPrinterParser:
+        """Return the library parser of the printer."""
+
+        if self._parser is None:
+            module = await _async_import_parser()
+            self._parser = module.DellPrinterParser(self.session, self.host)
+        return self._parser
+
+    async def _async_run(self, function: Callable, *args: Any) -> Any:
+        """Run a parse function in the parse pool, on the event loop without one."""
+
+        if self.parse_pool is None:
+            return function(*args)
+        return await self.parse_pool.async_run(function, *args)
+
+    def set_host(self, host: str) -> None:
+        """Switch to another address of the same printer."""
+
+        self.host = host
+        if self._parser is not None:
+            self._parser.ip = host
+
+    async def async_probe(self, host: Optional[str] = None) -> None:
+        """Check that the web interface answers on its host or another address, without loading a page."""
+
+        # any response will do, only connection errors and timeouts count as failures
+        url = "http://" + (host or self.host) + "/"
+        async with self.session.head(url, timeout=ClientTimeout(total=PROBE_TIMEOUT)):
+            pass
+
+    async def async_identify(self) -> Dict[str, Any]:
+        """Load only the information page, which carries the serial number and model."""
+
+        await self.async_set_language()
+        return await self.async_load(PRINTER_INFORMATION)
+
+    async def async_set_language(self) -> None:
+        """Reset the interface language, which the printer loses on reboot, before its pages are read."""
+
+        parser = await self.async_get_parser()
+        await parser._set_language()
+
+    async def async_load(self, group: str, sample: Optional[PollSample] = None) -> Dict[str, Any]:
+        """Reload one page group and return its data keys, timing it into the sample."""
+
+        url, _, _ = GROUPS[group]
+        timing = PageTiming(url)
+        if sample is not None:
+            sample.pages.append(timing)
+
+        response = await self.session.request(
+            method="GET", url="http://" + self.host + url, headers=self.cache.request_headers(url),
+            trace_request_ctx=timing
+        )
+
+        # the printer confirmed that the page did not change, conditional requests are only sent for cached pages
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            response.release()
+            timing.cached = True
+            return self.cache.not_modified(url)
+
+        response.raise_for_status()
+        if self.streaming and url not in self._unstreamable:
+            data = await self._async_stream(group, url, response, timing)
+            if data is not None:
+                return data
+
+            # the library needs the full page, from now on it is not streamed
+            _LOGGER.debug(f"Streamed page {url} does not match the fast extractor, loading it in full")
+            self._unstreamable.add(url)
+            response = await self.session.request(method="GET", url="http://" + self.host + url, trace_request_ctx=timing)
+            response.raise_for_status()
+
+        body = await response.read()
+        timing.size = len(body)
+
+        # the same bytes parse to the same data
+        digest, data = self.cache.lookup(url, body, response.headers)
+        if data is not None:
+            timing.cached = True
+            return data
+
+        text = await response.text()
+        # without the fast extractor the library is needed anyway, its import does not count as parsing
+        parser = None if self.fast_extractor else await self.async_get_parser()
+        data, timing.parse = await self._async_run(_parse, group, text, self.fast_extractor, parser)
+        if data is None:
+            _LOGGER.debug(f"Page {url} does not match the fast extractor, using the library")
+            data, seconds = await self._async_run(_parse, group, text, False, await self.async_get_parser())
+            timing.parse += seconds
+        self.parse_seconds += timing.parse
+        self.cache.store(url, digest, data, response.headers)
+        _LOGGER.debug(f"Parsed {url}, page cache hits: {self.cache.hits}, misses: {self.cache.misses}")
+        return data
+
+    async def _async_stream(
+        self, group: str, url: str, response: ClientResponse, timing: PageTiming
+    ) -> Optional[Dict[str, Any]]:
+        """Read a page in chunks into the fast extractor, closing the connection once it has all values.
+
+        Returns None if the page does not match the fast extractor.
+        """
+
+        extractor = StreamingExtractor(group, _encoding(response))
+        hasher = hashlib.blake2b(digest_size=16)
+        cached = None
+
+        # the data only depends on the start of the page that was read last time, if that did not change
+        length = self.cache.prefix_length(url)
+        try:
+            if length is not None:
+                try:
+                    prefix = await response.content.readexactly(length)
+                except asyncio.IncompleteReadError as error:
+                    prefix = error.partial
+                hasher.update(prefix)
+                timing.size = len(prefix)
+                cached = self.cache.lookup_digest(url, hasher.digest(), response.headers)
+                if cached is not None:
+                    timing.cached = True
+                    return cached
+                await self._async_run(extractor.feed, prefix)
+
+            while not extractor.complete:
+                chunk = await response.content.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                timing.size += len(chunk)
+                await self._async_run(extractor.feed, chunk)
+
+            data = await self._async_run(extractor.result)
+        finally:
+            complete = extractor.complete or cached is not None
+            if not response.content.at_eof() and response.content_length is not None:
+                timing.skipped = response.content_length - timing.size
+                self.skipped_bytes += timing.skipped
+
+            if response.connection is None:
+                # the whole page arrived already, emptying the buffer lets the pooled connection read again
+                response.content.read_nowait()
+            else:
+                # the rest of the page costs more than a new connection
+                response.close()
+
+        timing.parse = extractor.seconds
+        self.parse_seconds += timing.parse
+        if data is not None:
+            if length is None:
+                # a page read to its end that did not change since the last poll
+                cached = self.cache.lookup_digest(url, hasher.digest(), response.headers)
+                if cached is not None:
+                    timing.cached = True
+                    return cached
+            self.cache.store(url, hasher.digest(), data, response.headers, timing.size if complete else None)
+            _LOGGER.debug(f"Streamed {url}, skipped {timing.skipped} bytes")
+        return data
+
+
+def sub_unit_available(status: int) -> bool:
+    """Return True if a PrtSubUnitStatusTC (RFC 3805) is available and without a critical alert."""
+    return status & 7 in (0, 2, 4, 6) and not status & 16
+
+
+class DellPrinterProtocolClient(DellPrinterClient, ABC):
+    """Load the page groups a printer protocol covers with one request per poll, the others from the web interface."""
+
+    # page group -> keys answered by the protocol request
+    groups: Dict[str, List[str]] = {}
+
+    # keys the protocol lacks that do not change, read from the web interface once
+    static_keys: List[str] = []
+
+    def __init__(self, session: ClientSession, host: str, fast_extractor: bool = False) -> None:
+        """Initialize."""
+        super().__init__(session, host, fast_extractor)
+        self._static: Dict[str, Any] = {}
+
+        # the poll sample and request task of the last request, shared by the page groups of a poll
+        self._last_request: Optional[Tuple[Optional[PollSample], asyncio.Task]] = None
+
+    async def async_load(self, group: str, sample: Optional[PollSample] = None) -> Dict[str, Any]:
+        """Load a page group with the protocol if it covers it, from the web interface otherwise."""
+
+        if group not in self.groups:
+            return await super().async_load(group, sample)
+
+        # the groups of a poll load concurrently from the same request, so it is sent once,
+        # and a group that times out does not cancel it for the others
+        if sample is None or self._last_request is None or self._last_request[0] is not sample:
+            self._last_request = (sample, asyncio.create_task(self._async_request(sample)))
+        response = await asyncio.shield(self._last_request[1])
+        data = {key: response[key] for key in self.groups[group] if key in response}
+        data.update({key: value for key, value in self._static.items() if key in self.groups[group]})
+
+        # whatever the printer does not report with the protocol is read from its web interface
+        missing = [key for key in GROUP_KEYS[group] if key not in data]
+        if missing:
+            _LOGGER.debug(f"Loading {missing} of {self.host} from the web interface")
+            page = await super().async_load(group, sample)
+            self._static.update({key: page[key] for key in self.static_keys if key in page})
+            # the printer is identified by the information page, so its values keep the format of the web interface
+            data = {**data, **page} if group == PRINTER_INFORMATION else {**page, **data}
+        return data
+
+    @abstractmethod
+    async def _async_request(self, sample: Optional[PollSample]) -> Dict[str, Any]:
+        """Send the protocol request and map the response onto data keys, timing it into the sample."""
@@ -1,24 +1,51 @@
 """The Dell Printer component."""
 from homeassistant import config_entries, exceptions
 from homeassistant.components import zeroconf
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_SCAN_INTERVAL
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from dell_printer_parser.printer_parser import DellPrinterParser
+from aiohttp.client_exceptions import ClientConnectorError, ClientResponseError
 
-from aiohttp.client_exceptions import ClientConnectorError
-
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+import asyncio
 import ipaddress
 import re
 
 import logging
 import voluptuous as vol
 
-from .const import DEFAULT_NAME, DOMAIN, POLLING_INTERVAL
+from .addresses import url_host
+from .cache import Identity, IdentityCache
+from .client import DellPrinterClient
+from .const import (
+    BACKEND_HTML,
+    BACKENDS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADDRESSES,
+    CONF_BACKEND,
+    CONF_CONSUMPTION_HISTORY,
+    CONF_FAST_EXTRACTOR,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_SNMP_COMMUNITY,
+    CONF_STREAMING,
+    DATA_IDENTITIES,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_SNMP_COMMUNITY,
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_RETRY_TTL,
+    DOMAIN,
+    MODEL_NAME,
+    POLLING_INTERVAL,
+    PRINTER_SERIAL_NUMBER,
+    REQUEST_TIMEOUT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,8 +77,16 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self) -> None:
         """Initialize."""
-        self.printer: DellPrinterParser = None
+        self.model: str = None
         self.host: str = None
+        self.addresses: List[str] = []
+
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return DellPrinterOptionsFlow(config_entry)
 
 
     def _get_schema(self, user_input):
@@ -81,13 +116,13 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
                 # now let's try and see if we can connect to a printer
                 session = async_get_clientsession(self.hass)
-                printer = DellPrinterParser(session, user_input[CONF_HOST])
+                client = DellPrinterClient(session, user_input[CONF_HOST])
 
-                # try to load some data
-                await printer.load_data()
+                # the information page is enough to identify the printer, the shared session has no time limit
+                information = await asyncio.wait_for(client.async_identify(), REQUEST_TIMEOUT)
 
                 # use the serial number as unique id
-                unique_id = printer.information.printerSerialNumber
+                unique_id = information[PRINTER_SERIAL_NUMBER]
 
                 # check if we got something
                 if not unique_id:
@@ -99,16 +134,17 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
                 # compile a name from model and serial
                 return self.async_create_entry(
-                    title=user_input.get(CONF_NAME) or printer.information.modelName,
+                    title=user_input.get(CONF_NAME) or information[MODEL_NAME],
                     data=user_input
                 )
 
             except InvalidHost:
                 errors[CONF_HOST] = "wrong host"
-            except ConnectionError:
-                errors[CONF_HOST] = "cannot connect"
-            except ClientConnectorError:
+            except (ConnectionError, ClientConnectorError, asyncio.TimeoutError):
                 errors[CONF_HOST] = "cannot connect"
+            except (ClientResponseError, AttributeError):
+                # some other device without the Dell information page
+                errors['base'] = "printer model not supported"
             except UnsupportedModel:
                 errors['base'] = "printer model not supported"
 
@@ -125,42 +161,45 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ):
         """Handle zeroconf flow."""
 
-        errors = {}
-
         # extract some data from zeroconf
         self.host = discovery_info.host
+        self.addresses = self._addresses(discovery_info)
         _LOGGER.debug(f"discovered: {discovery_info}")
 
-        # if the hostname already exists, we can stop
-        self._async_abort_entries_match({CONF_HOST: self.host})
-
-        # now let's try and see if we can connect to a printer
-        session = async_get_clientsession(self.hass)
-        self.printer = DellPrinterParser(session, self.host)
-
-        # try to load some data
-        try:
-            await self.printer.load_data()
-        except ConnectionError:
-            self.async_abort(reason="cannot_connect")
-        except ClientConnectorError:
-            self.async_abort(reason="cannot_connect")
-
-        # use the serial number as unique id
-        unique_id = self.printer.information.printerSerialNumber
+        # if the printer is already set up, we can stop, after taking over its current addresses
+        for entry in self._async_current_entries(include_ignore=False):
+            known = {entry.data[CONF_HOST], *entry.data.get(CONF_ADDRESSES, [])}
+            if not known.isdisjoint(self.addresses):
+                if entry.data.get(CONF_ADDRESSES) != self.addresses:
+                    self.hass.config_entries.async_update_entry(
+                        entry, data={**entry.data, CONF_ADDRESSES: self.addresses}
+                    )
+                return self.async_abort(reason="already_configured")
+
+        # a printer announces itself on several addresses and repeatedly,
+        # so only ask addresses that were not identified recently
+        addresses = self.addresses
+        identities = self.hass.data.setdefault(DOMAIN, {}).setdefault(
+            DATA_IDENTITIES, IdentityCache(DISCOVERY_CACHE_TTL)
+        )
+        identity = identities.get(addresses)
+        if identity is None:
+            identity = await self._async_identify()
+            # a printer that did not answer may just be booting, so ask it again sooner
+            identities.put(addresses, identity, DISCOVERY_RETRY_TTL if identity.reason == "cannot_connect" else None)
 
-        # check if we got something
-        if not unique_id:
-            self.async_abort(reason="unsupported_model")
+        if identity.reason:
+            return self.async_abort(reason=identity.reason)
 
         # set the unique id for the entry, abort if it already exists
-        await self.async_set_unique_id(unique_id)
-        self._abort_if_unique_id_configured()
+        await self.async_set_unique_id(identity.serial)
+        self._abort_if_unique_id_configured(updates={CONF_ADDRESSES: self.addresses}, reload_on_update=False)
+        self.model = identity.model
 
         # store the data for the next step to get confirmation
         self.context.update({
             "title_placeholders": {
-                CONF_NAME: self.printer.information.modelName,
+                CONF_NAME: self.model,
                 CONF_SCAN_INTERVAL: POLLING_INTERVAL,
             }
         })
@@ -169,6 +208,38 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return await self.async_step_zeroconf_confirm()
 
 
+    @staticmethod
+    def _addresses(discovery_info: zeroconf.ZeroconfServiceInfo) -> List[str]:
+        """Return all addresses a printer announced, its server name last as it has to be resolved."""
+        addresses = [discovery_info.host]
+        for address in discovery_info.ip_addresses:
+            # link-local IPv6 addresses need the zone of the interface, which URLs do not carry
+            if not (address.version == 6 and address.is_link_local):
+                addresses.append(str(address))
+        if discovery_info.hostname:
+            addresses.append(discovery_info.hostname.rstrip("."))
+        return list(dict.fromkeys(addresses))
+
+
+    async def _async_identify(self) -> Identity:
+        """Load the serial number and model of the discovered printer."""
+
+        client = DellPrinterClient(async_get_clientsession(self.hass), url_host(self.host))
+        try:
+            # an address that accepts the connection but never answers would hold the flow without a time limit
+            information = await asyncio.wait_for(client.async_identify(), REQUEST_TIMEOUT)
+        except (ConnectionError, ClientConnectorError, asyncio.TimeoutError):
+            return Identity(reason="cannot_connect")
+        except (ClientResponseError, AttributeError):
+            # some other device without the Dell information page
+            return Identity(reason="unsupported_model")
+
+        # check if we got something
+        if not information[PRINTER_SERIAL_NUMBER]:
+            return Identity(reason="unsupported_model")
+        return Identity(information[PRINTER_SERIAL_NUMBER], information[MODEL_NAME])
+
+
     async def async_step_zeroconf_confirm(
         self,
         user_input: dict[str, Any] = None
@@ -179,16 +250,17 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             
             return self.async_create_entry(
-                title=self.printer.information.modelName,
+                title=self.model,
                 data={
                     CONF_NAME: user_input[CONF_NAME],
                     CONF_HOST: self.host,
+                    CONF_ADDRESSES: self.addresses,
                     CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL]
                 }
             )
 
         # show the form to the user
-        name = self.printer.information.modelName
+        name = self.model
         return self.async_show_form(
             step_id="zeroconf_confirm",
             data_schema=vol.Schema({
@@ -202,3 +274,54 @@ class DellPrinterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "model": name
             }
         )
+
+
+class DellPrinterOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for DELL printers."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize."""
+        self.config_entry = config_entry
+
+
+    async def async_step_init(self, user_input: dict[str, Any] = None) -> FlowResult:
+        """Manage the options."""
+        return await self.async_step_options(user_input)
+
+
+    async def async_step_options(self, user_input: dict[str, Any] = None) -> FlowResult:
+        """Configure polling of the printer."""
+
+        errors = {}
+
+        # user input was provided, so check and save it
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors[CONF_MIN_SCAN_INTERVAL] = "invalid_interval_range"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        # show the form with the current values as defaults
+        options = self.config_entry.options
+        scan_interval = options.get(CONF_SCAN_INTERVAL, self.config_entry.data[CONF_SCAN_INTERVAL])
+        schema = vol.Schema({
+            vol.Required(CONF_SCAN_INTERVAL, default=scan_interval): vol.All(
+                cv.positive_int,
+                vol.Range(min=10, max=600)
+            ),
+            vol.Required(CONF_ADAPTIVE_POLLING, default=options.get(CONF_ADAPTIVE_POLLING, False)): cv.boolean,
+            vol.Required(CONF_MIN_SCAN_INTERVAL, default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)): vol.All(
+                cv.positive_int,
+                vol.Range(min=5, max=600)
+            ),
+            vol.Required(CONF_MAX_SCAN_INTERVAL, default=options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)): vol.All(
+                cv.positive_int,
+                vol.Range(min=10, max=3600)
+            ),
+            vol.Required(CONF_FAST_EXTRACTOR, default=options.get(CONF_FAST_EXTRACTOR, False)): cv.boolean,
+            vol.Required(CONF_STREAMING, default=options.get(CONF_STREAMING, False)): cv.boolean,
+            vol.Required(CONF_CONSUMPTION_HISTORY, default=options.get(CONF_CONSUMPTION_HISTORY, True)): cv.boolean,
+            vol.Required(CONF_BACKEND, default=options.get(CONF_BACKEND, BACKEND_HTML)): vol.In(BACKENDS),
+            vol.Required(CONF_SNMP_COMMUNITY, default=options.get(CONF_SNMP_COMMUNITY, DEFAULT_SNMP_COMMUNITY)): cv.string,
+        })
+        return self.async_show_form(step_id="options", data_schema=schema, errors=errors)
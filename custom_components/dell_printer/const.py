@@ -1,19 +1,139 @@
 DOMAIN = "dell_printer"
 PLATFORMS = ["sensor", "binary_sensor"]
 DATA_CONFIG_ENTRY = "config_entry"
+DATA_FLEET = "fleet"
+DATA_IDENTITIES = "identities"
 
 # set polling interval to 30s
 POLLING_INTERVAL = 30
 
+# at most this many printers are scraped at the same time
+FLEET_MAX_CONCURRENT_POLLS = 4
+
+# worker threads that parse the pages of all printers, shared by all entries, so set in configuration.yaml
+CONF_PARSE_WORKERS = "parse_workers"
+PARSE_WORKERS = 2
+
+# fleet wide aggregates, maintained across all printers
+AGGREGATE_LOWEST_TONER = "lowest_toner"
+AGGREGATE_PAGES_TODAY = "pages_today"
+AGGREGATE_PRINTERS_IN_ERROR = "printers_in_error"
+FLEET_DEVICE = "fleet"
+ATTR_TONER = "toner"
+
+# stored with the last known data of a printer, its pages today count from there across restarts and reloads
+STORED_PAGES_TODAY = "pages_today"
+
+# seconds that importing the parser library and setting up an entry should take at most, logged when exceeded
+IMPORT_TIME_BUDGET = 0.5
+SETUP_TIME_BUDGET = 2.0
+
+# number of poll timings kept for diagnostics
+POLL_SAMPLES = 100
+
+# slower polling tiers for pages that rarely change (seconds)
+PRINT_VOLUME_INTERVAL = 600
+INFORMATION_INTERVAL = 6 * 3600
+
+# last known data is persisted per config entry
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN + ".{entry_id}"
+STORAGE_SAVE_DELAY = 60
+
+# consumption history per config entry, imported into long-term statistics a few minutes past every hour
+HISTORY_STORAGE_KEY = DOMAIN + ".{entry_id}.history"
+HISTORY_IMPORT_MINUTE = 5
+
+# hours of consumption kept without the recorder, in case it is loaded later
+HISTORY_MAX_HOURS = 24
+
+# weight of the latest interval in the smoothed toner consumption rates
+FORECAST_SMOOTHING = 0.3
+
+# fired once for every entry that appears on the events page of a printer
+EVENT_PRINTER_EVENT = DOMAIN + "_event"
+
+# on-demand refresh, calls within this many seconds after a refresh share its result
+SERVICE_REFRESH = "refresh"
+REFRESH_DEBOUNCE = 10
+
+# state attribute for entities showing restored data, or data of a page that failed to load
+ATTR_STALE = "stale"
+
+# printers restored from a snapshot are polled within this many seconds after setup, spread at random (seconds)
+RESTORED_POLL_WINDOW = 30
+
+# time limits of a single request to the printer (seconds)
+REQUEST_TIMEOUT = 20
+PROBE_TIMEOUT = 5
+
+# pages of a poll load concurrently, each within its own time limit and all within the deadline (seconds)
+PAGE_TIMEOUT = 10
+POLL_DEADLINE = 15
+
+# bytes read at a time when streaming a page
+STREAM_CHUNK_SIZE = 4096
+
+# circuit breaker of unreachable printers, backing off exponentially up to a cap (seconds)
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BACKOFF = 60
+BREAKER_MAX_BACKOFF = 3600
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+ATTR_CIRCUIT_BREAKER = "circuit_breaker"
+
+# discovered addresses are identified again after this many seconds, unreachable ones sooner
+DISCOVERY_CACHE_TTL = 3600
+DISCOVERY_RETRY_TTL = 300
+
+# all addresses a printer announced, raced once with this many seconds between attempts
+CONF_ADDRESSES = "addresses"
+HAPPY_EYEBALLS_DELAY = 0.25
+
 # configuration parameters
 DEFAULT_NAME = "Dell Printer"
 
+# adaptive polling between a floor and a ceiling, backing off geometrically while idle
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = 10
+DEFAULT_MAX_SCAN_INTERVAL = 600
+ADAPTIVE_BACKOFF_FACTOR = 2
+
+# parse pages with the in-tree extractor, falling back to the library
+CONF_FAST_EXTRACTOR = "fast_extractor"
+CONF_STREAMING = "streaming"
+
+# collect pages and toner used for the long-term statistics and the toner forecasts,
+# which follow the page count, so the print volume page is always loaded with it
+CONF_CONSUMPTION_HISTORY = "consumption_history"
+
+# backend to read the printer with, the web interface or SNMP or IPP with the web interface for what they lack
+CONF_BACKEND = "backend"
+CONF_SNMP_COMMUNITY = "snmp_community"
+BACKEND_HTML = "html"
+BACKEND_SNMP = "snmp"
+BACKEND_IPP = "ipp"
+BACKENDS = [BACKEND_HTML, BACKEND_SNMP, BACKEND_IPP]
+DEFAULT_SNMP_COMMUNITY = "public"
+SNMP_PORT = 161
+SNMP_TIMEOUT = 2
+SNMP_RETRIES = 1
+SNMP_MAX_REPETITIONS = 8
+IPP_PORT = 631
+IPP_BASE_PATH = "/ipp/print"
+
 # data keys
 PRINTER_INFORMATION = "printer_information"
 PRINTER_STATUS = "printer_status"
 PRINTER_PRINT_VOLUME = "printer_print_volume"
 PRINTER_EVENTS = "printer_events"
 
+# page groups in the order the printer web interface is scraped
+PAGE_GROUPS = [PRINTER_INFORMATION, PRINTER_PRINT_VOLUME, PRINTER_STATUS, PRINTER_EVENTS]
+
 MODEL_NAME = "model_name"
 DELL_SERVICE_TAG_NUMBER = "dell_service_tag_number"
 ASSET_TAG_NUMBER = "asset_tag_number"
@@ -55,5 +175,36 @@ PAPER_USED_DL = "paper_used_dl"
 PAPER_USED_C5 = "paper_used_c5"
 PAPER_USED_OTHERS = "paper_used_others"
 
+PAPER_USED = [
+    PAPER_USED_LETTER, PAPER_USED_B5, PAPER_USED_A5, PAPER_USED_A4, PAPER_USED_EXECUTIVE, PAPER_USED_FOLIO,
+    PAPER_USED_LEGAL, PAPER_USED_ENVELOPE, PAPER_USED_MONARCH, PAPER_USED_DL, PAPER_USED_C5, PAPER_USED_OTHERS,
+]
+
 EVENT_LOCATION = "location"
-EVENT_DETAILS = "details"
\ No newline at end of file
+EVENT_DETAILS = "details"
+
+# all (location, details) entries of the events page
+EVENT_LOG = "event_log"
+
+TONER_LEVELS = [CYAN_LEVEL, MAGENTA_LEVEL, YELLOW_LEVEL, BLACK_LEVEL]
+
+# data keys per page group
+GROUP_KEYS = {
+    PRINTER_INFORMATION: [
+        MODEL_NAME, DELL_SERVICE_TAG_NUMBER, ASSET_TAG_NUMBER, PRINTER_SERIAL_NUMBER, MEMORY_CAPACITY,
+        PROCESSOR_SPEED, FIRMWARE_VERSION, NETWORK_FIRMWARE_VERSION,
+    ],
+    PRINTER_STATUS: [
+        *TONER_LEVELS,
+        MULTI_PURPOSE_FEEDER_STATUS, MULTI_PURPOSE_FEEDER_CAPACITY, MULTI_PURPOSE_FEEDER_SIZE,
+        OUTPUT_TRAY_STATUS, OUTPUT_TRAY_CAPACITY, REAR_COVER_STATUS, ADF_COVER_STATUS, PRINTER_TYPE, PRINTING_SPEED,
+    ],
+    PRINTER_PRINT_VOLUME: [PRINTER_PAGE_COUNT, *PAPER_USED],
+    PRINTER_EVENTS: [EVENT_LOCATION, EVENT_DETAILS, EVENT_LOG],
+}
+
+# all data keys of a printer snapshot
+DATA_KEYS = [key for group in GROUP_KEYS.values() for key in group]
+
+# data key -> page group it is loaded with
+KEY_GROUPS = {key: group for group, keys in GROUP_KEYS.items() for key in keys}
@@ -0,0 +1,48 @@
+"""Diagnostics support for the Dell printer component."""
+from __future__ import annotations
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant
+
+from .const import *
+
+# the unique id of an entry is the serial number, the addresses include the host
+TO_REDACT = {CONF_HOST, CONF_ADDRESSES, CONF_UNIQUE_ID, PRINTER_SERIAL_NUMBER, DELL_SERVICE_TAG_NUMBER, ASSET_TAG_NUMBER}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "data": async_redact_data(coordinator.data.as_dict(), TO_REDACT),
+        "stale": coordinator.stale,
+        "poll_interval": coordinator.poll_interval.total_seconds(),
+        "setup_seconds": coordinator.setup_seconds,
+        "subscribed_groups": sorted(coordinator.subscribed_groups),
+        "circuit_breaker": {
+            "state": coordinator.breaker.state,
+            "failures": coordinator.breaker.failures,
+            "next_interval": coordinator.next_interval.total_seconds(),
+        },
+        "queue_delay": coordinator.queue_delay,
+        "poll_latency_p50": coordinator.poll_latency(50),
+        "poll_latency_p95": coordinator.poll_latency(95),
+        "bytes_per_poll": coordinator.bytes_per_poll,
+        "parse_seconds": coordinator.client.parse_seconds,
+        "skipped_bytes": coordinator.client.skipped_bytes,
+        "parse_queue": {
+            "depth": coordinator.fleet.parse_pool.depth,
+            "peak_depth": coordinator.fleet.parse_pool.peak_depth,
+        },
+        "page_cache": {
+            "hits": coordinator.client.cache.hits,
+            "misses": coordinator.client.cache.misses,
+        },
+        "polls": [sample.as_dict() for sample in coordinator.samples],
+    }
@@ -0,0 +1,468 @@
+"""Fast extraction of the printer pages without building a document tree.
+
+The locators below are the selectors of the dell-printer-parser library, compiled
+once into (tag, nth-of-type) paths. The pages are tokenized with the standard
+library HTML parser and only the handful of matching elements are kept.
+Whenever a page does not match, None is returned and the library parses it.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import codecs
+import re
+import time
+
+from .const import *
+
+# elements without content, as the tree builder of the library treats them
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+}
+
+# path of (tag, nth-of-type), None matches any position
+Path = Tuple[Tuple[str, Optional[int]], ...]
+
+_COMPOUND = re.compile(r"^([a-z0-9]+)(?::nth-of-type\((\d+)\))?$")
+
+
+def compile_selector(selector: str) -> Path:
+    """Compile a selector of child combinators into a path."""
+
+    path = []
+    for compound in selector.split(">"):
+        match = _COMPOUND.match(compound.strip())
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector}")
+        tag, nth = match.groups()
+        path.append((tag, int(nth) if nth else None))
+    return tuple(path)
+
+
+def _matches(path: Path, pattern: Path) -> bool:
+    """Return True if the end of the path matches the pattern."""
+
+    if len(path) < len(pattern):
+        return False
+    for (tag, nth), (pattern_tag, pattern_nth) in zip(path[-len(pattern):], pattern):
+        if tag != pattern_tag or (pattern_nth is not None and nth != pattern_nth):
+            return False
+    return True
+
+
+class _Node:
+    """Content of a matched element, kept to read its text like the library does."""
+
+    __slots__ = ("children",)
+
+    def __init__(self) -> None:
+        self.children: List[Any] = []
+
+    def add_text(self, text: str) -> None:
+        # adjacent text is a single string in the library tree
+        if self.children and isinstance(self.children[-1], str):
+            self.children[-1] += text
+        else:
+            self.children.append(text)
+
+    @property
+    def string(self) -> Optional[str]:
+        """Return the only string below the element, None if there is more than one child."""
+        if len(self.children) != 1:
+            return None
+        child = self.children[0]
+        return child if isinstance(child, str) else child.string
+
+    def get_text(self) -> str:
+        """Return all strings below the element, stripped and joined by spaces."""
+        texts = []
+        for child in self.children:
+            text = child.strip() if isinstance(child, str) else child.get_text()
+            if text:
+                texts.append(text)
+        return " ".join(texts)
+
+
+@dataclass(frozen=True)
+class Locator:
+    """Position of a single value on a page."""
+
+    key: str
+    container: Optional[Path]
+    field: Path
+    read: Optional[Callable[[_Node], Optional[str]]]
+    convert: Callable[[str], Any]
+    occurrence: int = 0
+    attribute: Optional[str] = None
+
+
+def _string(node: _Node) -> Optional[str]:
+    return node.string
+
+
+def _text(node: _Node) -> Optional[str]:
+    return node.get_text()
+
+
+def _strip(text: str) -> str:
+    """Strip like the library, which also removes literal backslash-n sequences."""
+    text = text.strip()
+    if text[-2:] == "\\n":
+        text = text[:-2]
+    if text[:2] == "\\n":
+        text = text[2:]
+    return text.strip()
+
+
+def _model_name(text: str) -> str:
+    return _strip(text).lstrip("Dell ")
+
+
+def _count(text: str) -> int:
+    return int(_strip(text))
+
+
+def _level(text: str) -> int:
+    return int(int(text) / 2)
+
+
+def _locators(container: str, fields: List[Tuple], read=_string, convert=_strip, attribute=None) -> List[Locator]:
+    """Compile the locators of the fields within one container."""
+
+    compiled = compile_selector(container)
+    return [
+        Locator(key, compiled, compile_selector(field), read, convert, attribute=attribute)
+        for key, field in fields
+    ]
+
+
+def _table(nth: int) -> str:
+    return f"body > table > tr > td > table:nth-of-type({nth}) > tr > td > table"
+
+
+def _cell(row: int) -> str:
+    return f"tr:nth-of-type({row}) > td:nth-of-type(2) > font"
+
+
+INFORMATION_LOCATORS = [
+    Locator(MODEL_NAME, None, compile_selector("title"), _string, _model_name),
+    *_locators(_table(4), [
+        (DELL_SERVICE_TAG_NUMBER, _cell(1)),
+        (ASSET_TAG_NUMBER, _cell(2)),
+        (PRINTER_SERIAL_NUMBER, _cell(3)),
+        (MEMORY_CAPACITY, _cell(4)),
+        (PROCESSOR_SPEED, _cell(5)),
+    ]),
+    *_locators(_table(5), [(FIRMWARE_VERSION, _cell(3))], read=_text),
+    *_locators(_table(5), [(NETWORK_FIRMWARE_VERSION, _cell(4))]),
+]
+
+PRINT_VOLUME_LOCATORS = [
+    *_locators(_table(2), [(PRINTER_PAGE_COUNT, "tr > td:nth-of-type(2) > font")], convert=_count),
+    *_locators(_table(3), [
+        (PAPER_USED_LETTER, _cell(1)),
+        (PAPER_USED_B5, _cell(2)),
+        (PAPER_USED_A5, _cell(3)),
+        (PAPER_USED_A4, _cell(4)),
+        (PAPER_USED_EXECUTIVE, _cell(5)),
+        (PAPER_USED_FOLIO, _cell(6)),
+        (PAPER_USED_LEGAL, _cell(7)),
+        (PAPER_USED_ENVELOPE, _cell(8)),
+        (PAPER_USED_MONARCH, _cell(9)),
+        (PAPER_USED_DL, _cell(10)),
+        (PAPER_USED_C5, _cell(11)),
+        (PAPER_USED_OTHERS, _cell(12)),
+    ], convert=_count),
+]
+
+STATUS_LOCATORS = [
+    *_locators(_table(4), [
+        (CYAN_LEVEL, "tr:nth-of-type(3) > td > table > tr > td"),
+        (MAGENTA_LEVEL, "tr:nth-of-type(5) > td > table > tr > td"),
+        (YELLOW_LEVEL, "tr:nth-of-type(7) > td > table > tr > td"),
+        (BLACK_LEVEL, "tr:nth-of-type(9) > td > table > tr > td"),
+    ], read=None, convert=_level, attribute="width"),
+    *_locators(_table(5), [
+        (MULTI_PURPOSE_FEEDER_STATUS, "tr:nth-of-type(2) > td:nth-of-type(2) > b"),
+        (MULTI_PURPOSE_FEEDER_CAPACITY, "tr:nth-of-type(2) > td:nth-of-type(3)"),
+        (MULTI_PURPOSE_FEEDER_SIZE, "tr:nth-of-type(2) > td:nth-of-type(4)"),
+    ]),
+    *_locators(_table(6), [
+        (OUTPUT_TRAY_STATUS, "tr:nth-of-type(2) > td:nth-of-type(2) > b"),
+        (OUTPUT_TRAY_CAPACITY, "tr:nth-of-type(2) > td:nth-of-type(3)"),
+    ]),
+    *_locators(_table(7), [
+        (REAR_COVER_STATUS, "tr:nth-of-type(2) > td:nth-of-type(2) > b"),
+        (ADF_COVER_STATUS, "tr:nth-of-type(3) > td:nth-of-type(2) > b"),
+    ]),
+    *_locators(_table(8), [(PRINTER_TYPE, "tr:nth-of-type(1) > td:nth-of-type(2)")]),
+    *_locators(_table(8), [(PRINTING_SPEED, "tr:nth-of-type(2) > td:nth-of-type(2)")], read=_text),
+]
+
+EVENTS_LOCATORS = [
+    Locator(EVENT_LOCATION, None, compile_selector("td > font > b"), _string, _strip, occurrence=1),
+    Locator(EVENT_DETAILS, None, compile_selector("td > font > b"), _string, _strip, occurrence=2),
+]
+
+LOCATORS = {
+    PRINTER_INFORMATION: INFORMATION_LOCATORS,
+    PRINTER_PRINT_VOLUME: PRINT_VOLUME_LOCATORS,
+    PRINTER_STATUS: STATUS_LOCATORS,
+    PRINTER_EVENTS: EVENTS_LOCATORS,
+}
+
+
+class _Frame:
+    """An open element on the tokenizer stack."""
+
+    __slots__ = ("tag", "nth", "path", "counts", "nodes", "captures")
+
+    def __init__(self, tag: str, nth: int, path: Path) -> None:
+        self.tag = tag
+        self.nth = nth
+        self.path = path
+        self.counts: Dict[str, int] = {}
+        self.nodes: List[_Node] = []
+        self.captures: List[Tuple[Locator, _Node]] = []
+
+
+class PageExtractor(HTMLParser):
+    """Locate the values of one page while it is tokenized."""
+
+    def __init__(self, locators: List[Locator]) -> None:
+        """Initialize."""
+
+        super().__init__(convert_charrefs=True)
+        self._locators = locators
+        self._stack = [_Frame("", 0, ())]
+
+        # stack depth of the first element matching each container, -1 once it closed
+        self._container_paths = {locator.container for locator in locators if locator.container}
+        self._containers: Dict[Path, int] = {}
+        self._occurrences: Dict[Locator, int] = {}
+        self._pending = set(locators)
+        self.values: Dict[str, str] = {}
+
+    @property
+    def complete(self) -> bool:
+        """Return True once every value was located."""
+        return not self._pending
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        parent = self._stack[-1]
+        nth = parent.counts[tag] = parent.counts.get(tag, 0) + 1
+        path = parent.path + ((tag, nth),)
+
+        if tag in VOID_ELEMENTS:
+            for node in parent.nodes:
+                node.children.append(_Node())
+            return
+
+        frame = _Frame(tag, nth, path)
+        for node in parent.nodes:
+            child = _Node()
+            node.children.append(child)
+            frame.nodes.append(child)
+        self._stack.append(frame)
+
+        depth = len(self._stack) - 1
+        for container in self._container_paths:
+            if container not in self._containers and _matches(path, container):
+                self._containers[container] = depth
+
+        for locator in list(self._pending):
+            if locator.container is None:
+                relative = path
+            else:
+                # fields are looked up below the first container only, like select_one() does
+                container_depth = self._containers.get(locator.container, -1)
+                if container_depth < 0 or container_depth >= depth:
+                    continue
+                relative = path[container_depth:]
+            if not _matches(relative, locator.field):
+                continue
+
+            # count matches in document order, like select() does
+            seen = self._occurrences.get(locator, 0)
+            self._occurrences[locator] = seen + 1
+            if seen != locator.occurrence:
+                continue
+
+            if locator.attribute:
+                self._pending.discard(locator)
+                self.values[locator.key] = dict(attrs).get(locator.attribute)
+            else:
+                node = _Node()
+                frame.nodes.append(node)
+                frame.captures.append((locator, node))
+
+    def handle_endtag(self, tag: str) -> None:
+        # close up to the most recent open element of this tag, ignore stray end tags
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                break
+        else:
+            return
+
+        while len(self._stack) > index:
+            frame = self._stack.pop()
+            for locator, node in frame.captures:
+                self._found(locator, node)
+
+            # a container that closed can not be bound again
+            for container, depth in self._containers.items():
+                if depth == len(self._stack):
+                    self._containers[container] = -1
+
+    def handle_data(self, data: str) -> None:
+        for node in self._stack[-1].nodes:
+            node.add_text(data)
+
+    def _found(self, locator: Locator, node: _Node) -> None:
+        self._pending.discard(locator)
+        self.values[locator.key] = locator.read(node)
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Return the converted values, None if the page did not match."""
+
+        # elements that are still open at the end of the page count as closed
+        for frame in reversed(self._stack):
+            for locator, node in frame.captures:
+                if locator.key not in self.values:
+                    self._found(locator, node)
+
+        if len(self.values) != len(self._locators):
+            return None
+        try:
+            return {
+                locator.key: locator.convert(self.values[locator.key])
+                for locator in self._locators
+            }
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+
+def extract_page(group: str, html: str) -> Optional[Dict[str, Any]]:
+    """Extract the data keys of a page group, None if the page does not match."""
+
+    extractor = PageExtractor(LOCATORS[group])
+    extractor.feed(html)
+    extractor.close()
+    return extractor.result()
+
+
+EVENT_ENTRY = compile_selector("td > font > b")
+
+
+class EventLogExtractor(HTMLParser):
+    """Collect the texts of all entries of the events page, of which the library reads the first only."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        super().__init__(convert_charrefs=True)
+        self._path: Path = ()
+        self._texts: List[str] = []
+        self._depth = 0
+        self.items: List[str] = []
+
+        # depth of the table around the first entry, the log is complete once it closed
+        self._table = 0
+        self.complete = False
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in VOID_ELEMENTS:
+            return
+        self._path += ((tag, None),)
+        if not self._depth and _matches(self._path, EVENT_ENTRY):
+            self._depth = len(self._path)
+            self._texts = []
+            if not self._table:
+                tables = [index for index, (open_tag, _) in enumerate(self._path) if open_tag == "table"]
+                self._table = tables[-1] + 1 if tables else 0
+
+    def handle_endtag(self, tag: str) -> None:
+        # close up to the most recent open element of this tag, ignore stray end tags
+        for index in range(len(self._path) - 1, -1, -1):
+            if self._path[index][0] == tag:
+                break
+        else:
+            return
+
+        self._path = self._path[:index]
+        if self._depth and len(self._path) < self._depth:
+            self.items.append(_strip("".join(self._texts)))
+            self._depth = 0
+        if self._table and len(self._path) < self._table:
+            self.complete = True
+
+    def handle_data(self, data: str) -> None:
+        if self._depth:
+            self._texts.append(data)
+
+
+def extract_event_log(html: str) -> Tuple[Tuple[str, str], ...]:
+    """Return the (location, details) of all entries of the events page."""
+
+    extractor = EventLogExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return _event_log(extractor.items)
+
+
+def _event_log(items: List[str]) -> Tuple[Tuple[str, str], ...]:
+    """Pair the entry texts of the events page."""
+
+    # the first entry is the heading of the table
+    items = items[1:]
+    return tuple(zip(items[0::2], items[1::2]))
+
+
+class StreamingExtractor:
+    """Extract the data keys of a page group from the chunks of its body as they arrive.
+
+    Once every value was located, and for the events page the table of the log
+    closed, the rest of the page can not change the data and need not be read.
+    """
+
+    def __init__(self, group: str, encoding: str) -> None:
+        """Initialize."""
+
+        self._page = PageExtractor(LOCATORS[group])
+        self._log = EventLogExtractor() if group == PRINTER_EVENTS else None
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+        # seconds spent decoding and tokenizing
+        self.seconds = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Return True once the rest of the page is not needed."""
+        return self._page.complete and (self._log is None or self._log.complete)
+
+    def feed(self, chunk: bytes) -> None:
+        """Tokenize the next chunk of the body."""
+
+        started = time.perf_counter()
+        text = self._decoder.decode(chunk)
+        self._page.feed(text)
+        if self._log is not None:
+            self._log.feed(text)
+        self.seconds += time.perf_counter() - started
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Return the data keys of the body fed so far, None if the page did not match."""
+
+        started = time.perf_counter()
+        text = self._decoder.decode(b"", final=True)
+        self._page.feed(text)
+        self._page.close()
+        data = self._page.result()
+        if data is not None and self._log is not None:
+            self._log.feed(text)
+            self._log.close()
+            data[EVENT_LOG] = _event_log(self._log.items)
+        self.seconds += time.perf_counter() - started
+        return data
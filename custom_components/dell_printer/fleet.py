@@ -0,0 +1,217 @@
+"""Fleet wide poll scheduling for the Dell printer component."""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+import asyncio
+import random
+import zlib
+
+from aiohttp import ClientTimeout
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_track_time_change
+
+from .aggregates import FleetAggregates
+from .const import *
+from .instrumentation import create_trace_config
+
+if TYPE_CHECKING:
+    from . import DellDataUpdateCoordinator
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParsePool:
+    """A bounded pool of worker threads that parse the pages of all printers off the event loop."""
+
+    def __init__(self, workers: int) -> None:
+        """Initialize."""
+
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix=DOMAIN + "_parse")
+
+        # pages waiting for or being parsed, now and at most since the start
+        self.depth = 0
+        self.peak_depth = 0
+
+
+    async def async_run(self, function: Callable, *args: Any) -> Any:
+        """Run a parse function in the pool and return its result."""
+
+        self.depth += 1
+        self.peak_depth = max(self.peak_depth, self.depth)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self.depth -= 1
+
+
+    def shutdown(self) -> None:
+        """Let the worker threads end once they are idle."""
+
+        self._executor.shutdown(wait=False)
+
+
+class DellPrinterFleet:
+    """Schedule the polls of all printers on one timer with bounded concurrency."""
+
+    def __init__(self, hass: HomeAssistant, max_concurrent_polls: int, parse_workers: int = PARSE_WORKERS) -> None:
+        """Initialize."""
+
+        self.hass = hass
+        self.semaphore = asyncio.Semaphore(max_concurrent_polls)
+
+        # pages of all printers are parsed in a few worker threads, stalls of the event loop add up with many printers
+        self.parse_pool = ParsePool(parse_workers)
+
+        @callback
+        def _async_shutdown(event: Event) -> None:
+            # no further polls start, those in flight end on their own
+            self._stopped = True
+            self._due.clear()
+            self._phase_due.clear()
+            self._arm()
+            self.parse_pool.shutdown()
+            self._cancel_new_day()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+
+        # one connection pool for all printers, traced to time the phases of every request,
+        # a request to a printer that went away gives up its connection after the timeout
+        self.session = async_create_clientsession(
+            hass, timeout=ClientTimeout(total=REQUEST_TIMEOUT), trace_configs=[create_trace_config()]
+        )
+        self._entries: Dict[str, ConfigEntry] = {}
+        self._coordinators: Dict[str, DellDataUpdateCoordinator] = {}
+
+        # next due poll per config entry, in event loop time
+        self._due: Dict[str, float] = {}
+        # slot of the own phase of a restored printer, which it moves to after its early poll
+        self._phase_due: Dict[str, float] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stopped = False
+
+        # one SNMP engine for all printers read with SNMP, created on first use
+        self._snmp_engine: Optional[Any] = None
+
+        # aggregates across all printers, the pages of today count from local midnight
+        self.aggregates = FleetAggregates()
+        self._cancel_new_day = async_track_time_change(
+            hass, self.aggregates.async_new_day, hour=0, minute=0, second=0
+        )
+
+
+    async def async_get_snmp_engine(self) -> Any:
+        """Return the shared SNMP engine, creating it in the executor because it loads MIBs from disk."""
+
+        if self._snmp_engine is None:
+            from .snmp import create_snmp_engine
+            self._snmp_engine = await self.hass.async_add_executor_job(create_snmp_engine)
+        return self._snmp_engine
+
+
+    @callback
+    def async_add(self, entry: ConfigEntry, coordinator: DellDataUpdateCoordinator) -> None:
+        """Add a printer, starting its polls at its own phase of the interval."""
+
+        self._entries[entry.entry_id] = entry
+        self._coordinators[entry.entry_id] = coordinator
+        now = self.hass.loop.time()
+        phase = self._phase(coordinator)
+        self._due[entry.entry_id] = now + phase
+
+        # restored data is stale until a poll confirms it, which should not wait up to a whole interval,
+        # the polls of all printers restored at startup are spread at random
+        early = random.uniform(0, RESTORED_POLL_WINDOW)
+        if coordinator.stale and early < phase:
+            self._due[entry.entry_id] = now + early
+            self._phase_due[entry.entry_id] = now + phase
+        self._arm()
+        self.aggregates.async_update(
+            coordinator.data[PRINTER_SERIAL_NUMBER], coordinator.data, coordinator.stored_pages
+        )
+
+
+    @callback
+    def async_remove(self, entry: ConfigEntry) -> None:
+        """Stop polling a printer."""
+
+        self._entries.pop(entry.entry_id, None)
+        coordinator = self._coordinators.pop(entry.entry_id, None)
+        self._due.pop(entry.entry_id, None)
+        self._phase_due.pop(entry.entry_id, None)
+        self._arm()
+        if coordinator is not None:
+            self.aggregates.async_remove(coordinator.data[PRINTER_SERIAL_NUMBER])
+
+
+    @staticmethod
+    def _phase(coordinator: DellDataUpdateCoordinator) -> float:
+        """Return the deterministic offset of a printer within its interval."""
+
+        # hash the serial number, so every printer keeps its slot across restarts
+        serial = coordinator.data[PRINTER_SERIAL_NUMBER]
+        fraction = zlib.crc32(serial.encode()) / 2**32
+        return fraction * coordinator.poll_interval.total_seconds()
+
+
+    @callback
+    def _arm(self) -> None:
+        """Set the timer to the earliest due poll."""
+
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._due and not self._stopped:
+            self._timer = self.hass.loop.call_at(min(self._due.values()), self._tick)
+
+
+    @callback
+    def _tick(self) -> None:
+        """Start all polls that are due."""
+
+        self._timer = None
+        if self._stopped:
+            return
+        now = self.hass.loop.time()
+        for entry_id, due in list(self._due.items()):
+            if due <= now:
+                del self._due[entry_id]
+                self.hass.async_create_task(self._async_poll(entry_id, due))
+        self._arm()
+
+
+    async def _async_poll(self, entry_id: str, due: float) -> None:
+        """Poll a printer and schedule its next poll on the same phase."""
+
+        # the printer may have been removed, or Home Assistant stopped, before the poll started
+        entry = self._entries.get(entry_id)
+        coordinator = self._coordinators.get(entry_id)
+        if entry is None or coordinator is None or self._stopped:
+            return
+
+        if not entry.pref_disable_polling:
+            coordinator.poll_due = due
+            await coordinator.async_refresh()
+
+        # the printer may have been removed, or Home Assistant stopped, while polling
+        if entry_id not in self._coordinators or self._stopped:
+            return
+
+        # skip slots that were missed, instead of polling several times in a row,
+        # after the early poll of a restored printer, continue at its own phase
+        interval = coordinator.next_interval.total_seconds()
+        now = self.hass.loop.time()
+        next_due = self._phase_due.pop(entry_id, due + interval)
+        if next_due <= now:
+            next_due += ((now - next_due) // interval + 1) * interval
+
+        self._due[entry_id] = next_due
+        self._arm()
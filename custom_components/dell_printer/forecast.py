@@ -0,0 +1,76 @@
+"""Online forecast of toner depletion."""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from .const import *
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class TonerForecast:
+    """Consumption rates of one toner, updated in constant time and memory per observation.
+
+    The printer reports levels in steps, so rates are measured between two drops of the level,
+    and smoothed exponentially. A rising level is a new cartridge, which starts a new measurement
+    but keeps the rates learned so far.
+    """
+
+    level: Optional[float] = None
+
+    # time (timestamp), page count and level of the last drop, None until a drop was seen
+    anchor_time: Optional[float] = None
+    anchor_pages: Optional[int] = None
+    anchor_level: Optional[float] = None
+
+    # smoothed consumption in percent per day and per page
+    per_day: Optional[float] = None
+    per_page: Optional[float] = None
+
+    def update(self, timestamp: float, level: float, pages: int) -> None:
+        """Add an observation of the toner level and page count."""
+
+        previous = self.level
+        self.level = level
+        if previous is None or level == previous:
+            return
+
+        # the level dropped since the last drop, so the interval between them is complete
+        if level < previous and self.anchor_time is not None:
+            consumed = self.anchor_level - level
+            days = (timestamp - self.anchor_time) / SECONDS_PER_DAY
+            printed = pages - self.anchor_pages
+            if days > 0:
+                self.per_day = self._smooth(self.per_day, consumed / days)
+            if printed > 0:
+                self.per_page = self._smooth(self.per_page, consumed / printed)
+
+        # every drop and every new cartridge starts the next interval
+        self.anchor_time = timestamp
+        self.anchor_pages = pages
+        self.anchor_level = level
+
+    @staticmethod
+    def _smooth(rate: Optional[float], sample: float) -> float:
+        if rate is None:
+            return sample
+        return FORECAST_SMOOTHING * sample + (1 - FORECAST_SMOOTHING) * rate
+
+    @property
+    def days_remaining(self) -> Optional[float]:
+        """Return the days until the toner is empty, None without an estimate."""
+        if self.level is None or not self.per_day:
+            return None
+        return self.level / self.per_day
+
+    @property
+    def pages_remaining(self) -> Optional[int]:
+        """Return the pages that can still be printed, None without an estimate."""
+        if self.level is None or not self.per_page:
+            return None
+        return int(self.level / self.per_page)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the forecast for storage."""
+        return asdict(self)
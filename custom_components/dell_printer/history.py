@@ -0,0 +1,150 @@
+"""Hourly consumption history of a printer, imported into long-term statistics."""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import *
+from .forecast import TonerForecast
+from .snapshot import PrinterSnapshot
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# statistic -> (data key, direction of consumption, name, unit),
+# the page counter rises while printing, toner levels fall
+STATISTICS = {
+    "pages": (PRINTER_PAGE_COUNT, 1, "pages printed", "pages"),
+    "cyan_toner": (CYAN_LEVEL, -1, "cyan toner used", "%"),
+    "magenta_toner": (MAGENTA_LEVEL, -1, "magenta toner used", "%"),
+    "yellow_toner": (YELLOW_LEVEL, -1, "yellow toner used", "%"),
+    "black_toner": (BLACK_LEVEL, -1, "black toner used", "%"),
+}
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class ConsumptionHistory:
+    """Collect page and toner deltas per hour and import completed hours as external statistics."""
+
+    def __init__(self, hass: HomeAssistant, store: Store, name: str, serial: str) -> None:
+        """Initialize."""
+
+        self.hass = hass
+        self._store = store
+        self._name = name
+        self._statistic_prefix = f"{DOMAIN}:{slugify(serial)}_"
+
+        # last value seen per statistic, to compute the next delta
+        self._last: Dict[str, float] = {}
+
+        # running sum per statistic of all imported hours
+        self._sums: Dict[str, float] = {}
+
+        # start of hour (isoformat) -> statistic -> consumption, not imported yet
+        self._buckets: Dict[str, Dict[str, float]] = {}
+
+        # depletion forecast per toner level key
+        self.forecasts: Dict[str, TonerForecast] = {key: TonerForecast() for key in TONER_LEVELS}
+
+
+    async def async_load(self) -> None:
+        """Load the history kept on disk."""
+
+        stored = await self._store.async_load() or {}
+        self._last = stored.get("last", {})
+        self._sums = stored.get("sums", {})
+        self._buckets = stored.get("buckets", {})
+        for key, forecast in stored.get("forecasts", {}).items():
+            self.forecasts[key] = TonerForecast(**forecast)
+
+
+    @callback
+    def record(self, now: datetime, data: PrinterSnapshot) -> None:
+        """Add the consumption since the previous poll to the current hour and update the forecasts."""
+
+        timestamp = now.timestamp()
+        for key, forecast in self.forecasts.items():
+            forecast.update(timestamp, data[key], data[PRINTER_PAGE_COUNT])
+
+        changed = False
+        for statistic, (key, direction, _, _) in STATISTICS.items():
+            value = data[key]
+            last = self._last.get(statistic)
+            if value == last:
+                continue
+            self._last[statistic] = value
+            changed = True
+
+            # a reset counter or a new cartridge is no consumption
+            if last is None or (value - last) * direction <= 0:
+                continue
+            bucket = self._buckets.setdefault(_hour(now).isoformat(), {})
+            bucket[statistic] = bucket.get(statistic, 0) + (value - last) * direction
+
+        if changed:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+
+    @callback
+    def async_import(self, now: datetime) -> None:
+        """Import all completed hours into long-term statistics, one batch per statistic."""
+
+        current = _hour(now)
+        if "recorder" not in self.hass.config.components:
+            # nothing is imported, so the hours would pile up in memory and on disk
+            oldest = current - timedelta(hours=HISTORY_MAX_HOURS)
+            expired = [hour for hour in self._buckets if datetime.fromisoformat(hour) < oldest]
+            for hour in expired:
+                del self._buckets[hour]
+            if expired:
+                _LOGGER.debug(f"Dropped {len(expired)} hours of consumption of {self._statistic_prefix}*, the recorder is not loaded")
+                self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+            return
+
+        hours = sorted(hour for hour in self._buckets if datetime.fromisoformat(hour) < current)
+        if not hours:
+            return
+
+        for statistic, (_, _, name, unit) in STATISTICS.items():
+            rows = []
+            for hour in hours:
+                consumption = self._buckets[hour].get(statistic)
+                if consumption is None:
+                    continue
+                self._sums[statistic] = self._sums.get(statistic, 0) + consumption
+                rows.append(StatisticData(start=datetime.fromisoformat(hour), sum=self._sums[statistic]))
+            if not rows:
+                continue
+
+            metadata = StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{self._name} {name}",
+                source=DOMAIN,
+                statistic_id=self._statistic_prefix + statistic,
+                unit_of_measurement=unit,
+            )
+            async_add_external_statistics(self.hass, metadata, rows)
+
+        _LOGGER.debug(f"Imported {len(hours)} hours of consumption into {self._statistic_prefix}*")
+        for hour in hours:
+            del self._buckets[hour]
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "last": self._last,
+            "sums": self._sums,
+            "buckets": self._buckets,
+            "forecasts": {key: forecast.as_dict() for key, forecast in self.forecasts.items()},
+        }
@@ -0,0 +1,124 @@
+"""Timing of the polls of the Dell printer component."""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import List, Optional
+
+import time
+
+from aiohttp import ClientSession, TraceConfig
+
+
+@dataclass
+class PageTiming:
+    """Phases of loading a single page, in seconds."""
+
+    url: str
+    resolve: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    size: int = 0
+    skipped: int = 0
+    parse: float = 0.0
+    cached: bool = False
+    _started: float = field(default=0.0, repr=False)
+    _resolve_started: float = field(default=0.0, repr=False)
+    _connect_started: float = field(default=0.0, repr=False)
+
+
+@dataclass
+class PollSample:
+    """Phases of a single poll, in seconds."""
+
+    started: str
+    queue_delay: float
+    pages: List[PageTiming] = field(default_factory=list)
+    total: float = 0.0
+    success: bool = False
+
+    @property
+    def size(self) -> int:
+        """Return the bytes received for all pages of the poll."""
+        return sum(page.size for page in self.pages)
+
+    def as_dict(self) -> dict:
+        """Return the sample for diagnostics."""
+        return {
+            "started": self.started,
+            "queue_delay": self.queue_delay,
+            "total": self.total,
+            "success": self.success,
+            "size": self.size,
+            "pages": [
+                {
+                    "url": page.url,
+                    "resolve": page.resolve,
+                    "connect": page.connect,
+                    "ttfb": page.ttfb,
+                    "size": page.size,
+                    "skipped": page.skipped,
+                    "parse": page.parse,
+                    "cached": page.cached,
+                }
+                for page in self.pages
+            ],
+        }
+
+
+def percentile(values: List[float], percent: int) -> Optional[float]:
+    """Return the nearest-rank percentile of the values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, -(-percent * len(ordered) // 100) - 1)
+    return ordered[rank]
+
+
+def _timing(trace_config_ctx: SimpleNamespace) -> Optional[PageTiming]:
+    """Return the page timing passed as trace_request_ctx, if any."""
+    timing = trace_config_ctx.trace_request_ctx
+    return timing if isinstance(timing, PageTiming) else None
+
+
+async def _on_request_start(session: ClientSession, trace_config_ctx: SimpleNamespace, params) -> None:
+    if timing := _timing(trace_config_ctx):
+        timing._started = time.perf_counter()
+
+
+async def _on_dns_resolvehost_start(session: ClientSession, trace_config_ctx: SimpleNamespace, params) -> None:
+    if timing := _timing(trace_config_ctx):
+        timing._resolve_started = time.perf_counter()
+
+
+async def _on_dns_resolvehost_end(session: ClientSession, trace_config_ctx: SimpleNamespace, params) -> None:
+    if timing := _timing(trace_config_ctx):
+        timing.resolve = time.perf_counter() - timing._resolve_started
+
+
+async def _on_connection_create_start(session: ClientSession, trace_config_ctx: SimpleNamespace, params) -> None:
+    if timing := _timing(trace_config_ctx):
+        timing._connect_started = time.perf_counter()
+
+
+async def _on_connection_create_end(session: ClientSession, trace_config_ctx: SimpleNamespace, params) -> None:
+    # creating a connection includes resolving the host
+    if timing := _timing(trace_config_ctx):
+        timing.connect = time.perf_counter() - timing._connect_started - timing.resolve
+
+
+async def _on_request_end(session: ClientSession, trace_config_ctx: SimpleNamespace, params) -> None:
+    # the request ends when the response headers arrived
+    if timing := _timing(trace_config_ctx):
+        timing.ttfb = time.perf_counter() - timing._started
+
+
+def create_trace_config() -> TraceConfig:
+    """Return a trace config that fills the PageTiming passed as trace_request_ctx."""
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
@@ -0,0 +1,201 @@
+"""IPP backend of the Dell printer component, reading the printer attributes (RFC 8011).
+
+Status, page count and events are read with a single Get-Printer-Attributes
+request on every poll, asking only for the attributes mapped below. IPP has no
+counterpart for the information page beyond model and firmware, for the pages
+printed per paper size or for the printer type, so those still come from the web
+interface, on their slower tiers or once.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+import time
+
+from aiohttp import ClientSession
+from pyipp import IPP, IPPError
+from pyipp.enums import IppOperation
+
+from .addresses import url_host
+from .client import DellPrinterProtocolClient, host_address, sub_unit_available
+from .const import *
+from .instrumentation import PageTiming, PollSample
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+MARKER_NAMES = "marker-names"
+MARKER_LEVELS = "marker-levels"
+MARKER_HIGH_LEVELS = "marker-high-levels"
+STATE_MESSAGE = "printer-state-message"
+STATE_REASONS = "printer-state-reasons"
+INPUT_TRAY = "printer-input-tray"
+OUTPUT_TRAY = "printer-output-tray"
+MEDIA_READY = "media-ready"
+PAGES_PER_MINUTE = "pages-per-minute"
+PAGES_PER_MINUTE_COLOR = "pages-per-minute-color"
+IMPRESSIONS_COMPLETED = "printer-impressions-completed"
+
+ATTRIBUTES = [
+    MARKER_NAMES, MARKER_LEVELS, MARKER_HIGH_LEVELS, STATE_MESSAGE, STATE_REASONS,
+    INPUT_TRAY, OUTPUT_TRAY, MEDIA_READY, PAGES_PER_MINUTE, PAGES_PER_MINUTE_COLOR, IMPRESSIONS_COMPLETED,
+]
+
+# marker name -> toner level key
+TONER_COLORS = {"cyan": CYAN_LEVEL, "magenta": MAGENTA_LEVEL, "yellow": YELLOW_LEVEL, "black": BLACK_LEVEL}
+
+# PWG media size name -> paper size of the web interface
+MEDIA_SIZES = {
+    "a4": "A4", "a5": "A5", "b5": "B5", "letter": "Letter", "legal": "Legal", "executive": "Executive",
+    "folio": "Folio", "monarch": "Monarch", "dl": "DL", "c5": "C5",
+}
+
+# printer-state-reasons keyword -> event location of the web interface
+REASON_LOCATIONS = {
+    "media-jam": "Media Path", "media-empty": "Tray", "media-needed": "Tray", "input-tray-missing": "Tray",
+    "cover-open": "Cover", "door-open": "Cover", "interlock-open": "Cover",
+    "toner-low": "Consumables", "toner-empty": "Consumables", "marker-supply-low": "Consumables",
+    "marker-supply-empty": "Consumables", "output-area-full": "Output Tray", "output-tray-missing": "Output Tray",
+}
+
+# reasons of an open cover, which IPP does not attribute to the rear or the ADF cover
+COVER_REASONS = {"cover-open", "door-open", "interlock-open"}
+
+# keys IPP has no counterpart for, they do not change and are read from the web interface once
+STATIC_KEYS = [PRINTER_TYPE]
+
+# page groups read with IPP, with the keys of the request
+IPP_GROUPS = {
+    PRINTER_STATUS: [*GROUP_KEYS[PRINTER_STATUS], PRINTER_PAGE_COUNT],
+    PRINTER_EVENTS: GROUP_KEYS[PRINTER_EVENTS],
+}
+
+
+def _list(value) -> List:
+    """Return an attribute as list, the parser returns single values as they are."""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _reason(keyword: str) -> str:
+    """Return a state reason without its severity suffix."""
+    for suffix in ("-report", "-warning", "-error"):
+        if keyword.endswith(suffix):
+            return keyword[:-len(suffix)]
+    return keyword
+
+
+def _tray(value: str) -> Dict[str, str]:
+    """Return the fields of a printer-input-tray or printer-output-tray value (PWG 5100.13)."""
+    return dict(field.split("=", 1) for field in value.split(";") if "=" in field)
+
+
+def _media_size(name: str) -> str:
+    """Return the paper size of a PWG self-describing media name, like iso_a4_210x297mm."""
+    parts = name.split("_")
+    size = parts[1] if len(parts) == 3 else name
+    return MEDIA_SIZES.get(size.lower(), size)
+
+
+def _status_data(attributes: Dict[str, Any], reasons: List[str]) -> Dict[str, Any]:
+    """Map the printer attributes onto the keys of the status page and the page count."""
+
+    data = {}
+    if attributes.get(IMPRESSIONS_COMPLETED) is not None:
+        data[PRINTER_PAGE_COUNT] = attributes[IMPRESSIONS_COMPLETED]
+
+    # levels in percent of the high level, unknown levels (negative) are left to the web interface
+    markers = zip(_list(attributes.get(MARKER_NAMES)), _list(attributes.get(MARKER_LEVELS)),
+                  _list(attributes.get(MARKER_HIGH_LEVELS)) or [100] * len(_list(attributes.get(MARKER_NAMES))))
+    for name, level, high in markers:
+        for color, key in TONER_COLORS.items():
+            if color in name.lower() and key not in data and high > 0 and level >= 0:
+                data[key] = int(level * 100 / high)
+
+    # both covers are closed unless a reason says otherwise, an open one is looked up on the web interface
+    if STATE_REASONS in attributes and not COVER_REASONS.intersection(reasons):
+        data[REAR_COVER_STATUS] = "Closed"
+        data[ADF_COVER_STATUS] = "Closed"
+
+    media = _list(attributes.get(MEDIA_READY))
+    for tray in map(_tray, _list(attributes.get(INPUT_TRAY))):
+        if "mpf" in tray.get("name", "").lower() or tray.get("type") == "sheetFeedManual":
+            data[MULTI_PURPOSE_FEEDER_STATUS] = (
+                "Ready" if sub_unit_available(int(tray.get("status", 0))) and tray.get("level") != "0" else "Not Ready"
+            )
+            data[MULTI_PURPOSE_FEEDER_CAPACITY] = f"{tray.get('maxcapacity')} Sheets"
+            if media:
+                data[MULTI_PURPOSE_FEEDER_SIZE] = _media_size(media[0])
+            break
+
+    for tray in map(_tray, _list(attributes.get(OUTPUT_TRAY))[:1]):
+        data[OUTPUT_TRAY_STATUS] = "OK" if sub_unit_available(int(tray.get("status", 0))) else "Not Available"
+        data[OUTPUT_TRAY_CAPACITY] = f"{tray.get('maxcapacity')} Sheets"
+
+    if attributes.get(PAGES_PER_MINUTE) is not None and attributes.get(PAGES_PER_MINUTE_COLOR) is not None:
+        data[PRINTING_SPEED] = f"Color {attributes[PAGES_PER_MINUTE_COLOR]} ppm Mono {attributes[PAGES_PER_MINUTE]} ppm"
+
+    return data
+
+
+def _events_data(attributes: Dict[str, Any], reasons: List[str]) -> Dict[str, Any]:
+    """Map the state reasons onto the keys of the events page, the state message when there is none."""
+
+    log = tuple(
+        (REASON_LOCATIONS.get(reason, "Printer"), reason.replace("-", " ").title())
+        for reason in reasons
+        if reason != "none"
+    )
+    if not log and attributes.get(STATE_MESSAGE):
+        log = (("Printer", attributes[STATE_MESSAGE]),)
+    if not log:
+        return {}
+    return {EVENT_LOCATION: log[0][0], EVENT_DETAILS: log[0][1], EVENT_LOG: log}
+
+
+class DellPrinterIppClient(DellPrinterProtocolClient):
+    """Load status and events with one Get-Printer-Attributes request, the other page groups from the web interface."""
+
+    groups = IPP_GROUPS
+    static_keys = STATIC_KEYS
+
+    def __init__(self, session: ClientSession, host: str, fast_extractor: bool = False, port: int = IPP_PORT) -> None:
+        """Initialize."""
+        super().__init__(session, host, fast_extractor)
+        self._port = port
+        self.set_host(host)
+
+    def set_host(self, host: str) -> None:
+        """Switch to another address of the same printer."""
+
+        super().set_host(host)
+        # the web interface host may carry a port, IPP has its own
+        self._uri = f"ipp://{url_host(host_address(host))}:{self._port}{IPP_BASE_PATH}"
+        self._ipp = IPP(self._uri, request_timeout=REQUEST_TIMEOUT, session=self.session)
+
+    async def _async_request(self, sample: Optional[PollSample]) -> Dict[str, Any]:
+        """Read the printer attributes with a single request and map them onto data keys."""
+
+        # the host is left out, like the paths of the web interface pages
+        timing = PageTiming("ipp:" + IPP_BASE_PATH)
+        if sample is not None:
+            sample.pages.append(timing)
+
+        started = time.perf_counter()
+        try:
+            response = await self._ipp.execute(
+                IppOperation.GET_PRINTER_ATTRIBUTES,
+                {"operation-attributes-tag": {"requested-attributes": ATTRIBUTES}},
+            )
+        except IPPError as error:
+            raise ConnectionError(f"IPP request to {self.host} failed: {error}") from error
+        timing.ttfb = time.perf_counter() - started
+
+        started = time.perf_counter()
+        attributes = next(iter(response["printers"]), {})
+        reasons = [_reason(keyword) for keyword in _list(attributes.get(STATE_REASONS))]
+        data = {**_status_data(attributes, reasons), **_events_data(attributes, reasons)}
+        timing.parse = time.perf_counter() - started
+        self.parse_seconds += timing.parse
+        return data
@@ -1,5 +1,6 @@
-from typing import Callable, Any, Dict
+from typing import Callable, Any, Dict, Optional
 from custom_components.dell_printer import DellDataUpdateCoordinator, DellPrinterEntity
+from custom_components.dell_printer.aggregates import FleetAggregates
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.typing import HomeAssistantType
@@ -12,6 +13,9 @@ from .const import *
 
 _LOGGER = logging.getLogger(__name__)
 
+# toner name -> level key
+TONERS = {"Cyan": CYAN_LEVEL, "Magenta": MAGENTA_LEVEL, "Yellow": YELLOW_LEVEL, "Black": BLACK_LEVEL}
+
 
 async def async_setup_entry(hass: HomeAssistantType, entry: ConfigEntry, async_add_entities: Callable):
     """Setup sensor entity."""
@@ -26,8 +30,21 @@ async def async_setup_entry(hass: HomeAssistantType, entry: ConfigEntry, async_a
     entities.append(MagentaStatus(coordinator))
     entities.append(YellowStatus(coordinator))
     entities.append(BlackStatus(coordinator))
-    
-    async_add_entities(entities, update_before_add=True)
+    if coordinator.history:
+        for name, level_key in TONERS.items():
+            entities.append(TonerDaysRemaining(coordinator, name, level_key))
+            entities.append(TonerPagesRemaining(coordinator, name, level_key))
+    entities.append(PollLatency(coordinator, 50))
+    entities.append(PollLatency(coordinator, 95))
+    entities.append(PollBytes(coordinator))
+
+    async_add_entities(entities)
+
+    # the aggregates of all printers come with one of the printers, another one takes over when it unloads
+    aggregates = coordinator.fleet.aggregates
+    aggregates.async_add_provider(entry.entry_id, lambda: async_add_entities([
+        FleetLowestToner(aggregates), FleetPagesToday(aggregates), FleetPrintersInError(aggregates)
+    ]))
     return True
 
 
@@ -35,7 +52,7 @@ class PrintVolume(DellPrinterEntity, SensorEntity):
     """Representation of a sensor."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator)
+        super().__init__(coordinator, [PRINTER_PAGE_COUNT, *PAPER_USED])
         self._attr_unique_id = self._serialNumber + "_print_volume"
         self.entity_id = "sensor." + slugify(DEFAULT_NAME + " Print Volume")
         self._attr_name = "Print Volume"
@@ -49,19 +66,15 @@ class PrintVolume(DellPrinterEntity, SensorEntity):
         return self.coordinator.data[PRINTER_PAGE_COUNT]
 
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        return {
-            paper.removeprefix("paper_used_"): used
-            for paper, used in self.coordinator.data.items()
-            if paper.startswith("paper_")
-        }
+    def printer_attributes(self) -> Dict[str, Any]:
+        return self.coordinator.data.paper_used
 
 
 class TonerStatus(DellPrinterEntity, SensorEntity):
     """Representation of a toner sensor."""
 
-    def __init__(self, coordinator: DellDataUpdateCoordinator, name: str):
-        super().__init__(coordinator)
+    def __init__(self, coordinator: DellDataUpdateCoordinator, name: str, level_key: str):
+        super().__init__(coordinator, [level_key])
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_native_unit_of_measurement = "%"
         self._attr_state_class = "measurement"
@@ -69,23 +82,19 @@ class TonerStatus(DellPrinterEntity, SensorEntity):
         self._attr_unique_id = self._serialNumber + "_" + self.lower_name          
         self.entity_id = "sensor." + slugify(DEFAULT_NAME + " " + name)
         self._attr_name = name
+        self._level_key = level_key
 
     @property
     def icon(self) -> str:
         """Return icon depending on state."""
-        if self.state >= 10:
-            return "mdi:water"
-        elif self.state >= 2:
-            return "mdi:water-alert"
-        else:
-            return "mdi:water-off"
+        return self.coordinator.data.toner_icons[self._level_key]
 
 
 class CyanStatus(TonerStatus):
     """Representation of cyan toner."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Cyan")
+        super().__init__(coordinator, "Cyan", CYAN_LEVEL)
 
     @property
     def state(self) -> int:
@@ -96,7 +105,7 @@ class MagentaStatus(TonerStatus):
     """Representation of magenta toner."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Magenta")
+        super().__init__(coordinator, "Magenta", MAGENTA_LEVEL)
 
     @property
     def state(self) -> int:
@@ -107,7 +116,7 @@ class YellowStatus(TonerStatus):
     """Representation of yellow toner."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Yellow")
+        super().__init__(coordinator, "Yellow", YELLOW_LEVEL)
 
     @property
     def state(self) -> int:
@@ -118,8 +127,171 @@ class BlackStatus(TonerStatus):
     """Representation of black toner."""
 
     def __init__(self, coordinator: DellDataUpdateCoordinator):
-        super().__init__(coordinator, "Black")
+        super().__init__(coordinator, "Black", BLACK_LEVEL)
+
+    @property
+    def state(self) -> int:
+        return self.coordinator.data[BLACK_LEVEL]
+
+
+class TonerForecastSensor(DellPrinterEntity, SensorEntity):
+    """Representation of a toner depletion forecast."""
+
+    def __init__(self, coordinator: DellDataUpdateCoordinator, name: str, level_key: str):
+        # forecasts move with the toner level and the page count
+        super().__init__(coordinator, [level_key, PRINTER_PAGE_COUNT])
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_state_class = "measurement"
+        self.lower_name = name.lower().replace(" ", "_")
+        self._attr_unique_id = self._serialNumber + "_" + self.lower_name
+        self.entity_id = "sensor." + slugify(DEFAULT_NAME + " " + name)
+        self._attr_name = name
+        self._forecast = coordinator.history.forecasts[level_key]
+
+
+class TonerDaysRemaining(TonerForecastSensor):
+    """Representation of the days until a toner is empty."""
+
+    def __init__(self, coordinator: DellDataUpdateCoordinator, toner: str, level_key: str):
+        super().__init__(coordinator, toner + " Days Remaining", level_key)
+        self._attr_icon = "mdi:calendar-clock"
+        self._attr_native_unit_of_measurement = "d"
+
+    @property
+    def state(self) -> Optional[float]:
+        days = self._forecast.days_remaining
+        return round(days, 1) if days is not None else None
+
+
+class TonerPagesRemaining(TonerForecastSensor):
+    """Representation of the pages that a toner still prints."""
+
+    def __init__(self, coordinator: DellDataUpdateCoordinator, toner: str, level_key: str):
+        super().__init__(coordinator, toner + " Pages Remaining", level_key)
+        self._attr_icon = "mdi:file-document-multiple-outline"
+        self._attr_native_unit_of_measurement = "pages"
+
+    @property
+    def state(self) -> Optional[int]:
+        return self._forecast.pages_remaining
+
+
+class PollStatistic(DellPrinterEntity, SensorEntity):
+    """Representation of a statistic about polling the printer, disabled by default."""
+
+    def __init__(self, coordinator: DellDataUpdateCoordinator, name: str):
+        # statistics change with every poll, so they listen to all updates
+        super().__init__(coordinator, None)
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_state_class = "measurement"
+        self.lower_name = name.lower().replace(" ", "_")
+        self._attr_unique_id = self._serialNumber + "_" + self.lower_name
+        self.entity_id = "sensor." + slugify(DEFAULT_NAME + " " + name)
+        self._attr_name = name
+
+
+class PollLatency(PollStatistic):
+    """Representation of a percentile of the poll duration."""
+
+    def __init__(self, coordinator: DellDataUpdateCoordinator, percent: int):
+        super().__init__(coordinator, f"Poll Latency P{percent}")
+        self._percent = percent
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_native_unit_of_measurement = "ms"
+
+    @property
+    def state(self) -> Optional[float]:
+        latency = self.coordinator.poll_latency(self._percent)
+        return round(latency * 1000, 1) if latency is not None else None
+
+
+class PollBytes(PollStatistic):
+    """Representation of the bytes received per poll."""
+
+    def __init__(self, coordinator: DellDataUpdateCoordinator):
+        super().__init__(coordinator, "Bytes per Poll")
+        self._attr_icon = "mdi:download-network-outline"
+        self._attr_native_unit_of_measurement = "B"
+
+    @property
+    def state(self) -> Optional[int]:
+        size = self.coordinator.bytes_per_poll
+        return round(size) if size is not None else None
+
+
+class FleetAggregate(SensorEntity):
+    """Representation of an aggregate across all printers."""
+
+    def __init__(self, aggregates: FleetAggregates, aggregate: str, name: str):
+        self._aggregates = aggregates
+        self._aggregate = aggregate
+        self._attr_unique_id = DOMAIN + "_fleet_" + aggregate
+        self.entity_id = "sensor." + slugify(DEFAULT_NAME + " Fleet " + name)
+        self._attr_name = "Fleet " + name
+        self._attr_should_poll = False
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {
+                (DOMAIN, FLEET_DEVICE)
+            },
+            "name": "Dell Printer Fleet",
+            "manufacturer": "Dell",
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever the aggregate changes."""
+        self.async_on_remove(self._aggregates.async_add_listener(self.async_write_ha_state, self._aggregate))
+
+
+class FleetLowestToner(FleetAggregate):
+    """Representation of the lowest toner level across all printers."""
+
+    def __init__(self, aggregates: FleetAggregates):
+        super().__init__(aggregates, AGGREGATE_LOWEST_TONER, "Lowest Toner")
+        self._attr_icon = "mdi:water-alert"
+        self._attr_native_unit_of_measurement = "%"
+        self._attr_state_class = "measurement"
+
+    @property
+    def state(self) -> Optional[int]:
+        lowest = self._aggregates.lowest_toner
+        return lowest[2] if lowest is not None else None
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        lowest = self._aggregates.lowest_toner
+        if lowest is None:
+            return None
+        serial, key, _ = lowest
+        toner = next(name for name, level_key in TONERS.items() if level_key == key)
+        return {PRINTER_SERIAL_NUMBER: serial, ATTR_TONER: toner}
+
+
+class FleetPagesToday(FleetAggregate):
+    """Representation of the pages printed today across all printers."""
+
+    def __init__(self, aggregates: FleetAggregates):
+        super().__init__(aggregates, AGGREGATE_PAGES_TODAY, "Pages Today")
+        self._attr_icon = "mdi:file-document-multiple-outline"
+        self._attr_native_unit_of_measurement = "pages"
+        self._attr_state_class = "total_increasing"
+
+    @property
+    def state(self) -> int:
+        return self._aggregates.pages_today
+
+
+class FleetPrintersInError(FleetAggregate):
+    """Representation of the number of printers reporting an error."""
+
+    def __init__(self, aggregates: FleetAggregates):
+        super().__init__(aggregates, AGGREGATE_PRINTERS_IN_ERROR, "Printers in Error")
+        self._attr_icon = "mdi:printer-alert"
+        self._attr_state_class = "measurement"
 
     @property
     def state(self) -> int:
-        return self.coordinator.data[BLACK_LEVEL]
\ No newline at end of file
+        return self._aggregates.printers_in_error
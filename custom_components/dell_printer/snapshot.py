@@ -0,0 +1,68 @@
+"""Immutable record of the printer data of one poll."""
+from __future__ import annotations
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Set
+
+from .const import *
+
+_DATA_KEYS = frozenset(DATA_KEYS)
+
+
+def _toner_icon(level: int) -> str:
+    """Return the icon of a toner level."""
+    if level >= 10:
+        return "mdi:water"
+    elif level >= 2:
+        return "mdi:water-alert"
+    else:
+        return "mdi:water-off"
+
+
+class PrinterSnapshot:
+    """Data keys of the printer, with the values derived from them computed once per poll.
+
+    Data keys are read like from the dict this replaces, snapshot[key] or snapshot.get(key).
+    """
+
+    __slots__ = (*DATA_KEYS, "paper_used", "error", "toner_icons")
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        """Initialize from a complete mapping of data keys."""
+
+        for key in DATA_KEYS:
+            object.__setattr__(self, key, data[key])
+
+        # paper size -> pages printed, as shown in the print volume attributes
+        object.__setattr__(self, "paper_used", MappingProxyType({
+            key.removeprefix("paper_used_"): data[key] for key in PAPER_USED
+        }))
+        object.__setattr__(self, "error", "ready" not in data[EVENT_DETAILS].lower())
+        object.__setattr__(self, "toner_icons", MappingProxyType({
+            key: _toner_icon(data[key]) for key in TONER_LEVELS
+        }))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _DATA_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a data key, default if there is no such key."""
+        return getattr(self, key) if key in _DATA_KEYS else default
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the data keys as a dict, for storage and diagnostics."""
+        return {key: getattr(self, key) for key in DATA_KEYS}
+
+    def replace(self, updates: Mapping[str, Any]) -> PrinterSnapshot:
+        """Return a new snapshot with some data keys replaced."""
+        return PrinterSnapshot({**self.as_dict(), **updates})
+
+    def changed_keys(self, previous: Optional[PrinterSnapshot]) -> Set[str]:
+        """Return the data keys whose value differs from the previous snapshot."""
+        if previous is None:
+            return set(DATA_KEYS)
+        return {key for key in DATA_KEYS if getattr(self, key) != getattr(previous, key)}
@@ -0,0 +1,236 @@
+"""SNMP backend of the Dell printer component, reading the Printer-MIB (RFC 3805).
+
+Status, page count and events are read with a single GETBULK request on every
+poll, together with the model (hrDeviceDescr of the Host Resources MIB) and the
+serial number of the information page. The Dell service and asset tags, memory,
+processor and firmware versions have no standard object, nor do the pages printed
+per paper size or the printer type and speed, so those still come from the web
+interface, on their slower tiers or once. As the information page is loaded
+anyway, its model and serial number take precedence, in the format the printer
+was set up with, and the SNMP values only fill in what the page lacks.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+import time
+
+from aiohttp import ClientSession
+from pysnmp.hlapi.v3arch.asyncio import (
+    CommunityData,
+    ContextData,
+    ObjectIdentity,
+    ObjectType,
+    SnmpEngine,
+    UdpTransportTarget,
+    bulk_cmd,
+)
+from pysnmp.hlapi.varbinds import MibViewControllerManager
+from pysnmp.proto.rfc1902 import OctetString
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
+
+from .client import DellPrinterProtocolClient, host_address, sub_unit_available
+from .const import *
+from .instrumentation import PageTiming, PollSample
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# scalars, requested as the column of which they are the first instance
+MARKER_LIFE_COUNT = "1.3.6.1.2.1.43.10.2.1.4"
+CONSOLE_DISPLAY_TEXT = "1.3.6.1.2.1.43.16.5.1.2"
+GENERAL_SERIAL_NUMBER = "1.3.6.1.2.1.43.5.1.1.17"
+DEVICE_DESCRIPTION = "1.3.6.1.2.1.25.3.2.1.3"
+
+# table columns, walked for a few rows each
+SUPPLIES_DESCRIPTION = "1.3.6.1.2.1.43.11.1.1.6"
+SUPPLIES_MAX_CAPACITY = "1.3.6.1.2.1.43.11.1.1.8"
+SUPPLIES_LEVEL = "1.3.6.1.2.1.43.11.1.1.9"
+COVER_DESCRIPTION = "1.3.6.1.2.1.43.6.1.1.2"
+COVER_STATUS = "1.3.6.1.2.1.43.6.1.1.3"
+INPUT_MAX_CAPACITY = "1.3.6.1.2.1.43.8.2.1.9"
+INPUT_CURRENT_LEVEL = "1.3.6.1.2.1.43.8.2.1.10"
+INPUT_STATUS = "1.3.6.1.2.1.43.8.2.1.11"
+INPUT_MEDIA_NAME = "1.3.6.1.2.1.43.8.2.1.12"
+INPUT_NAME = "1.3.6.1.2.1.43.8.2.1.13"
+OUTPUT_MAX_CAPACITY = "1.3.6.1.2.1.43.9.2.1.4"
+OUTPUT_STATUS = "1.3.6.1.2.1.43.9.2.1.6"
+ALERT_GROUP = "1.3.6.1.2.1.43.18.1.1.4"
+ALERT_DESCRIPTION = "1.3.6.1.2.1.43.18.1.1.8"
+
+SCALARS = [MARKER_LIFE_COUNT, CONSOLE_DISPLAY_TEXT, GENERAL_SERIAL_NUMBER, DEVICE_DESCRIPTION]
+COLUMNS = [
+    SUPPLIES_DESCRIPTION, SUPPLIES_MAX_CAPACITY, SUPPLIES_LEVEL,
+    COVER_DESCRIPTION, COVER_STATUS,
+    INPUT_MAX_CAPACITY, INPUT_CURRENT_LEVEL, INPUT_STATUS, INPUT_MEDIA_NAME, INPUT_NAME,
+    OUTPUT_MAX_CAPACITY, OUTPUT_STATUS,
+    ALERT_GROUP, ALERT_DESCRIPTION,
+]
+
+# supply description -> toner level key
+TONER_COLORS = {"cyan": CYAN_LEVEL, "magenta": MAGENTA_LEVEL, "yellow": YELLOW_LEVEL, "black": BLACK_LEVEL}
+
+# prtCoverStatus -> cover status of the web interface
+COVER_STATES = {3: "Open", 4: "Closed", 5: "Open", 6: "Closed"}
+
+# prtAlertGroup -> event location of the web interface
+ALERT_LOCATIONS = {5: "Printer", 6: "Cover", 8: "Tray", 9: "Output Tray", 11: "Consumables", 13: "Media Path"}
+
+# keys the MIB has no counterpart for, they do not change and are read from the web interface once
+STATIC_KEYS = [PRINTER_TYPE, PRINTING_SPEED]
+
+# page groups read with SNMP, with the keys of the request
+SNMP_GROUPS = {
+    PRINTER_INFORMATION: [MODEL_NAME, PRINTER_SERIAL_NUMBER],
+    PRINTER_STATUS: [*GROUP_KEYS[PRINTER_STATUS], PRINTER_PAGE_COUNT],
+    PRINTER_EVENTS: GROUP_KEYS[PRINTER_EVENTS],
+}
+
+
+def create_snmp_engine() -> SnmpEngine:
+    """Return an SNMP engine with its MIB view loaded, which reads from disk."""
+    engine = SnmpEngine()
+    MibViewControllerManager.get_mib_view_controller(engine.cache)
+    return engine
+
+
+def _value(value) -> Any:
+    """Return a response value as str or int, None if the agent has no such object."""
+    if isinstance(value, (EndOfMibView, NoSuchInstance, NoSuchObject)):
+        return None
+    if isinstance(value, OctetString):
+        return bytes(value.asOctets()).decode("utf-8", "replace").strip("\x00 ")
+    return int(value)
+
+
+def _rows(columns: Dict[str, Dict[str, Any]], *names: str) -> List[Tuple]:
+    """Return the values of some columns of a table, one tuple per row present in all of them."""
+    rows = []
+    for index in columns.get(names[0], {}):
+        row = tuple(columns.get(name, {}).get(index) for name in names)
+        if None not in row:
+            rows.append(row)
+    return rows
+
+
+def _information_data(scalars: Dict[str, Any]) -> Dict[str, Any]:
+    """Map the device description and the serial number onto the keys of the information page."""
+
+    data = {}
+    if scalars.get(DEVICE_DESCRIPTION):
+        data[MODEL_NAME] = scalars[DEVICE_DESCRIPTION]
+    if scalars.get(GENERAL_SERIAL_NUMBER):
+        data[PRINTER_SERIAL_NUMBER] = scalars[GENERAL_SERIAL_NUMBER]
+    return data
+
+
+def _status_data(scalars: Dict[str, Any], columns: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Map the Printer-MIB onto the keys of the status page and the page count."""
+
+    data = {}
+    if scalars.get(MARKER_LIFE_COUNT) is not None:
+        data[PRINTER_PAGE_COUNT] = scalars[MARKER_LIFE_COUNT]
+
+    # levels in percent of the capacity, unknown levels (negative) are left to the web interface
+    for description, capacity, level in _rows(columns, SUPPLIES_DESCRIPTION, SUPPLIES_MAX_CAPACITY, SUPPLIES_LEVEL):
+        for color, key in TONER_COLORS.items():
+            if color in description.lower() and key not in data and capacity > 0 and level >= 0:
+                data[key] = int(level * 100 / capacity)
+
+    for description, status in _rows(columns, COVER_DESCRIPTION, COVER_STATUS):
+        if status in COVER_STATES and "rear" in description.lower():
+            data[REAR_COVER_STATUS] = COVER_STATES[status]
+        elif status in COVER_STATES and "adf" in description.lower():
+            data[ADF_COVER_STATUS] = COVER_STATES[status]
+
+    inputs = _rows(columns, INPUT_NAME, INPUT_MAX_CAPACITY, INPUT_CURRENT_LEVEL, INPUT_STATUS, INPUT_MEDIA_NAME)
+    for name, capacity, level, status, media in inputs:
+        if "mpf" in name.lower() or "multi" in name.lower():
+            data[MULTI_PURPOSE_FEEDER_STATUS] = "Ready" if sub_unit_available(status) and level != 0 else "Not Ready"
+            data[MULTI_PURPOSE_FEEDER_CAPACITY] = f"{capacity} Sheets"
+            data[MULTI_PURPOSE_FEEDER_SIZE] = media
+            break
+
+    for capacity, status in _rows(columns, OUTPUT_MAX_CAPACITY, OUTPUT_STATUS)[:1]:
+        data[OUTPUT_TRAY_STATUS] = "OK" if sub_unit_available(status) else "Not Available"
+        data[OUTPUT_TRAY_CAPACITY] = f"{capacity} Sheets"
+
+    return data
+
+
+def _events_data(scalars: Dict[str, Any], columns: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Map the alert table onto the keys of the events page, the display text when there is no alert."""
+
+    log = tuple(
+        (ALERT_LOCATIONS.get(group, "Printer"), description)
+        for group, description in _rows(columns, ALERT_GROUP, ALERT_DESCRIPTION)
+        if description
+    )
+    if not log and scalars.get(CONSOLE_DISPLAY_TEXT):
+        log = (("Printer", scalars[CONSOLE_DISPLAY_TEXT]),)
+    if not log:
+        return {}
+    return {EVENT_LOCATION: log[0][0], EVENT_DETAILS: log[0][1], EVENT_LOG: log}
+
+
+class DellPrinterSnmpClient(DellPrinterProtocolClient):
+    """Load status, events, model and serial number with one GETBULK request, the rest from the web interface."""
+
+    groups = SNMP_GROUPS
+    static_keys = STATIC_KEYS
+
+    def __init__(self, session: ClientSession, host: str, engine: SnmpEngine, community: str, fast_extractor: bool = False, port: int = SNMP_PORT) -> None:
+        """Initialize."""
+        super().__init__(session, host, fast_extractor)
+        self._engine = engine
+        self._auth = CommunityData(community, mpModel=1)
+        self._port = port
+        self._target: Optional[UdpTransportTarget] = None
+
+    def set_host(self, host: str) -> None:
+        """Switch to another address of the same printer."""
+        super().set_host(host)
+        self._target = None
+
+    async def _async_request(self, sample: Optional[PollSample]) -> Dict[str, Any]:
+        """Read the scalars and table columns with a single GETBULK request and map them onto data keys."""
+
+        if self._target is None:
+            # the web interface host may carry a port, SNMP has its own
+            self._target = await UdpTransportTarget.create(
+                (host_address(self.host), self._port), timeout=SNMP_TIMEOUT, retries=SNMP_RETRIES
+            )
+
+        # the host is left out, like the paths of the web interface pages
+        timing = PageTiming("snmp:")
+        if sample is not None:
+            sample.pages.append(timing)
+
+        started = time.perf_counter()
+        error_indication, error_status, error_index, var_binds = await bulk_cmd(
+            self._engine, self._auth, self._target, ContextData(), len(SCALARS), SNMP_MAX_REPETITIONS,
+            *(ObjectType(ObjectIdentity(oid)) for oid in SCALARS + COLUMNS),
+            lookupMib=False,
+        )
+        timing.ttfb = time.perf_counter() - started
+        if error_indication or error_status:
+            raise ConnectionError(f"SNMP request to {self.host} failed: {error_indication or error_status.prettyPrint()}")
+
+        started = time.perf_counter()
+        scalars: Dict[str, Any] = {}
+        columns: Dict[str, Dict[str, Any]] = {}
+        for position, (oid, value) in enumerate(var_binds):
+            oid = str(oid)
+            if position < len(SCALARS):
+                if oid.startswith(SCALARS[position] + "."):
+                    scalars[SCALARS[position]] = _value(value)
+                continue
+            for column in COLUMNS:
+                if oid.startswith(column + "."):
+                    columns.setdefault(column, {})[oid[len(column) + 1:]] = _value(value)
+                    break
+
+        data = {**_information_data(scalars), **_status_data(scalars, columns), **_events_data(scalars, columns)}
+        timing.parse = time.perf_counter() - started
+        self.parse_seconds += timing.parse
+        return data
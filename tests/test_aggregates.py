@@ -0,0 +1,85 @@
+"""Fleet wide aggregates: the indexed min-heap and the pages printed today."""
+from datetime import datetime
+import random
+
+from custom_components.dell_printer.aggregates import FleetAggregates, IndexedMinHeap
+from custom_components.dell_printer.const import *
+from custom_components.dell_printer.snapshot import PrinterSnapshot
+
+
+def _snapshot(count: int, levels=(50, 40, 30, 20), details: str = "Ready to Print") -> PrinterSnapshot:
+    data = {key: "" for key in DATA_KEYS}
+    data.update({key: 0 for key in PAPER_USED})
+    data.update(zip(TONER_LEVELS, levels))
+    data.update({PRINTER_PAGE_COUNT: count, EVENT_LOCATION: "Printer", EVENT_DETAILS: details, EVENT_LOG: ()})
+    return PrinterSnapshot(data)
+
+
+def test_heap_matches_a_dict():
+    heap, reference = IndexedMinHeap(), {}
+    rng = random.Random(1765)
+    for _ in range(5000):
+        key = rng.randrange(50)
+        if rng.random() < 0.3:
+            heap.remove(key)
+            reference.pop(key, None)
+        else:
+            value = rng.randrange(100)
+            heap.set(key, value)
+            reference[key] = value
+
+        assert len(heap) == len(reference)
+        lowest = heap.min()
+        if not reference:
+            assert lowest is None
+        else:
+            key, value = lowest
+            assert value == min(reference.values())
+            assert reference[key] == value
+
+
+def test_lowest_toner_and_errors():
+    aggregates = FleetAggregates()
+    aggregates.async_update("A", _snapshot(100, (50, 40, 30, 20)))
+    aggregates.async_update("B", _snapshot(500, (90, 90, 9, 90), "Paper Jam"))
+
+    assert aggregates.lowest_toner == ("B", YELLOW_LEVEL, 9)
+    assert aggregates.printers_in_error == 1
+
+    aggregates.async_remove("B")
+    assert aggregates.lowest_toner == ("A", BLACK_LEVEL, 20)
+    assert aggregates.printers_in_error == 0
+
+
+def test_pages_today_roll_over_at_midnight():
+    aggregates = FleetAggregates()
+    aggregates.async_update("A", _snapshot(100))
+    aggregates.async_update("A", _snapshot(110))
+    assert aggregates.pages_today == 10
+
+    aggregates.async_new_day(datetime(2030, 1, 2))
+    assert aggregates.pages_today == 0
+
+    # the new day counts from the last page count of the previous one
+    aggregates.async_update("A", _snapshot(112))
+    assert aggregates.pages_today == 2
+    assert aggregates.pages("A") == ("2030-01-02", 110, 112)
+
+
+def test_pages_today_count_from_the_stored_start():
+    aggregates = FleetAggregates()
+    aggregates.async_update("A", _snapshot(100))
+    aggregates.async_update("A", _snapshot(110))
+    stored = list(aggregates.pages("A"))
+
+    # a reload removes the printer and adds it again with its stored page counts, as JSON stores them
+    aggregates.async_remove("A")
+    assert aggregates.pages_today == 0
+    aggregates.async_update("A", _snapshot(115), stored)
+    assert aggregates.pages_today == 15
+
+
+def test_pages_today_stored_on_a_previous_day():
+    aggregates = FleetAggregates()
+    aggregates.async_update("A", _snapshot(120), ["2000-01-01", 100, 110])
+    assert aggregates.pages_today == 10
@@ -0,0 +1,87 @@
+"""Equivalence of the fast extractor and the parser library on saved printer pages."""
+from pathlib import Path
+
+import pytest
+
+from dell_printer_parser.printer_parser import DellPrinterParser
+
+from custom_components.dell_printer.client import GROUPS
+from custom_components.dell_printer.const import *
+from custom_components.dell_printer.extractor import StreamingExtractor, extract_event_log, extract_page
+
+FIXTURES = Path(__file__).parent / "fixtures" / "c1765nfw"
+
+# page group -> saved page
+PAGES = {
+    PRINTER_INFORMATION: "information.html",
+    PRINTER_PRINT_VOLUME: "print_volume.html",
+    PRINTER_STATUS: "status.html",
+    PRINTER_EVENTS: "events.html",
+}
+
+
+def _page(group: str) -> str:
+    return (FIXTURES / PAGES[group]).read_text(encoding="utf-8")
+
+
+def _library(group: str, html: str) -> dict:
+    """Return the data keys of a page as the parser library reads them."""
+    _, extract, mapping = GROUPS[group]
+    parser = DellPrinterParser(None, "")
+    getattr(parser, extract)(html)
+    return mapping(parser)
+
+
+def _streamed(group: str, html: str, chunk_size: int) -> dict:
+    """Feed a page to the streaming extractor in chunks, stopping once it is complete."""
+    body = html.encode("utf-8")
+    extractor = StreamingExtractor(group, "utf-8")
+    for start in range(0, len(body), chunk_size):
+        if extractor.complete:
+            break
+        extractor.feed(body[start:start + chunk_size])
+    return extractor.result()
+
+
+@pytest.mark.parametrize("group", PAGES)
+def test_extract_page_matches_library(group):
+    html = _page(group)
+    data = extract_page(group, html)
+    assert data is not None
+    assert data == _library(group, html)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+@pytest.mark.parametrize("group", PAGES)
+def test_streaming_matches_library(group, chunk_size):
+    html = _page(group)
+    data = _streamed(group, html, chunk_size)
+    assert data is not None
+    expected = _library(group, html)
+    if group == PRINTER_EVENTS:
+        expected[EVENT_LOG] = extract_event_log(html)
+    assert data == expected
+
+
+@pytest.mark.parametrize("group", PAGES)
+def test_streaming_stops_before_the_end(group):
+    body = _page(group).encode("utf-8")
+    extractor = StreamingExtractor(group, "utf-8")
+    read = 0
+    while not extractor.complete and read < len(body):
+        extractor.feed(body[read:read + 64])
+        read += 64
+    assert extractor.complete
+    assert read < len(body)
+
+
+def test_event_log():
+    assert extract_event_log(_page(PRINTER_EVENTS)) == (
+        ("Tray 1", "Load Paper\xa0A4"),
+        ("Consumables", "Yellow Toner Low"),
+        ("Cover", "ADF Cover Open"),
+    )
+
+
+def test_unknown_page_is_left_to_the_library():
+    assert extract_page(PRINTER_STATUS, _page(PRINTER_INFORMATION)) is None